@@ -0,0 +1,209 @@
+# IT Infrastructure Ontology - Memoized Analysis Pipeline
+# Used by ontology_visualization.py (CELL 3 onwards)
+
+"""
+Dependency-tracked memoization for the notebook DataFrames.
+
+Every DataFrame (df_apps, df_infra, ...) and chart input is declared as a
+stage with explicit inputs: the graph version (a hash of the TTL files),
+its SPARQL query, its parameters, the code of its function and the keys
+of the stages it reads. Results are stored as Parquet files named after
+that key, so a stage only recomputes when one of its inputs changed, and
+the TTL files are only parsed when some stage actually has to run.
+"""
+
+import hashlib
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+from rdflib import Graph, Literal
+
+
+def graph_version(files):
+    """Content hash of the input files (unchanged files, same version)"""
+    digest = hashlib.sha256()
+    for path in map(Path, files):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def query_to_dataframe(graph, sparql_query, bindings=None):
+    """Execute SPARQL query and return results as DataFrame."""
+    results = graph.query(sparql_query, initBindings=bindings or {})
+    data = []
+    for row in results:
+        data.append({str(var): str(row[var]) if row[var] else None
+                    for var in results.vars})
+    return pd.DataFrame(data)
+
+
+def _code_fingerprint(func):
+    """Bytecode, constants and names of a function, so edits to it invalidate the stage"""
+    digest = hashlib.sha256()
+    pending = [func.__code__]
+    while pending:
+        code = pending.pop()
+        digest.update(code.co_code)
+        digest.update(repr(code.co_names).encode("utf-8"))
+        for const in code.co_consts:
+            # Nested functions and comprehensions are code objects whose
+            # repr contains a memory address
+            if hasattr(const, "co_code"):
+                pending.append(const)
+            else:
+                digest.update(repr(const).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class Pipeline:
+    """Memoized stages over one set of TTL files"""
+
+    def __init__(self, files, cache_dir=".pipeline-cache"):
+        self.files = [Path(f) for f in files]
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.version = graph_version(self.files)
+        self.keys = {}
+        self.frames = {}
+        self.log = {}
+        self._graph = None
+
+    @property
+    def graph(self):
+        """The parsed graph, loaded on first use only"""
+        if self._graph is None:
+            self._graph = Graph()
+            for path in self.files:
+                self._graph.parse(path, format="turtle")
+        return self._graph
+
+    def _key(self, name, query, params, func, inputs, uses_graph):
+        unknown = [i for i in inputs if i not in self.frames]
+        if unknown:
+            raise KeyError(f"Stage {name} reads undeclared stage(s): {', '.join(unknown)}")
+        declaration = {
+            "stage": name,
+            "graph": self.version if uses_graph else None,
+            "query": query,
+            "params": params,
+            "code": _code_fingerprint(func) if func else None,
+            "inputs": [self.keys[i] for i in inputs],
+        }
+        encoded = json.dumps(declaration, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+    def stage(self, name, func=None, inputs=(), params=None, query=None, uses_graph=False):
+        """Declare a stage and return its DataFrame, recomputing only if needed
+
+        A query stage runs query against the graph (params become SPARQL
+        bindings). Otherwise func is called with the graph (if
+        uses_graph), then the DataFrames of inputs, then params as
+        keyword arguments, and must return a DataFrame.
+        """
+        params = params or {}
+        uses_graph = uses_graph or query is not None
+        key = self._key(name, query, params, func, inputs, uses_graph)
+        self.keys[name] = key
+        path = self.cache_dir / f"{name}-{key}.parquet"
+
+        start_time = time.time()
+        if path.exists():
+            df = pd.read_parquet(path)
+            status = "cached"
+        else:
+            if query is not None:
+                bindings = {k: Literal(v) for k, v in params.items()}
+                df = query_to_dataframe(self.graph, query, bindings)
+            else:
+                args = [self.graph] if uses_graph else []
+                args += [self.frames[i] for i in inputs]
+                df = func(*args, **params)
+            for stale in self.cache_dir.glob(f"{name}-*.parquet"):
+                stale.unlink()
+            df.to_parquet(path)
+            status = "ran"
+        self.frames[name] = df
+        self.log[name] = (status, time.time() - start_time, len(df))
+        return df
+
+    def query(self, name, query, params=None):
+        """Declare a SPARQL query stage"""
+        return self.stage(name, query=query, params=params)
+
+    def report(self):
+        """Print which stages ran or came from the cache, and how long each took"""
+        print(f"{'Stage':<20} {'Status':<8} {'Rows':>6} {'Time (ms)':>10}")
+        print("-"*47)
+        for name, (status, seconds, rows) in self.log.items():
+            print(f"{name:<20} {status:<8} {rows:>6} {seconds*1000:>10.1f}")
+        ran = sum(1 for status, _, _ in self.log.values() if status == "ran")
+        total = sum(seconds for _, seconds, _ in self.log.values())
+        print(f"\n{ran} of {len(self.log)} stage(s) recomputed in {total:.3f} seconds "
+              f"(graph {'parsed' if self._graph is not None else 'not parsed'})")
+
+
+SELF_CHECK_DATA = """
+@prefix : <http://example.org/it-infrastructure-ontology#> .
+@prefix inst: <http://example.org/instances#> .
+inst:App1 a :Application ; :name "Order API" ; :lifecycle_status "running" .
+inst:App2 a :Application ; :name "Billing" ; :lifecycle_status "failed" .
+"""
+
+SELF_CHECK_QUERY = """
+PREFIX : <http://example.org/it-infrastructure-ontology#>
+SELECT ?name WHERE { ?app a :Application ; :name ?name ; :lifecycle_status ?status . }
+"""
+
+
+def self_check():
+    """Check that unchanged inputs are served from the cache and changed ones recompute"""
+    def count(df):
+        return pd.DataFrame({"apps": [len(df)]})
+
+    def labels(prefix):
+        return pd.DataFrame({"label": [f"{prefix}-{i}" for i in range(3)]})
+
+    def run(files, cache_dir, status):
+        pipeline = Pipeline(files, cache_dir)
+        pipeline.query("apps", SELF_CHECK_QUERY, params={"status": status})
+        pipeline.stage("app_count", count, inputs=["apps"])
+        pipeline.stage("labels", labels, params={"prefix": "x"})
+        return pipeline, {name: status for name, (status, _, _) in pipeline.log.items()}
+
+    checks = []
+    with tempfile.TemporaryDirectory() as tmp:
+        data = Path(tmp) / "data.ttl"
+        data.write_text(SELF_CHECK_DATA, encoding="utf-8")
+        cache_dir = Path(tmp) / "cache"
+
+        _, first = run([data], cache_dir, "running")
+        checks.append(("First run computes every stage", set(first.values()) == {"ran"}))
+
+        pipeline, second = run([data], cache_dir, "running")
+        checks.append(("Unchanged inputs are all cached without parsing the graph",
+                       set(second.values()) == {"cached"} and pipeline._graph is None))
+        checks.append(("Cached results equal the computed ones",
+                       pipeline.frames["app_count"]["apps"][0] == 1))
+
+        pipeline, third = run([data], cache_dir, "failed")
+        checks.append(("Changed params recompute the stage and its readers only",
+                       third == {"apps": "ran", "app_count": "ran", "labels": "cached"}))
+
+        data.write_text(SELF_CHECK_DATA.replace("Billing", "Billing API"), encoding="utf-8")
+        _, fourth = run([data], cache_dir, "failed")
+        checks.append(("Changed TTL files recompute the graph stages only",
+                       fourth == {"apps": "ran", "app_count": "ran", "labels": "cached"}))
+
+    for name, passed in checks:
+        print(f"  {'[OK]' if passed else '[FAIL]'} {name}")
+    return all(passed for _, passed in checks)
+
+
+if __name__ == "__main__":
+    print("Analysis pipeline memoization self-check")
+    sys.exit(0 if self_check() else 1)
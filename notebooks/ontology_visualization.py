@@ -5,7 +5,7 @@
 # CELL 1: Install Required Packages (run once)
 # ============================================================================
 """
-!pip install rdflib pandas matplotlib networkx pyvis plotly
+!pip install rdflib pandas pyarrow matplotlib networkx pyvis plotly
 """
 
 # ============================================================================
@@ -22,6 +22,7 @@ import plotly.graph_objects as go
 import plotly.express as px
 from collections import Counter
 import warnings
+from analysis_pipeline import Pipeline
 warnings.filterwarnings('ignore')
 
 # Set display options
@@ -39,27 +40,20 @@ print("✓ Libraries imported successfully")
 ONT = Namespace("http://example.org/it-infrastructure-ontology#")
 INST = Namespace("http://example.org/instances#")
 
-# Load the ontology and data
-g = Graph()
-g.parse("../ontology/it-infrastructure-ontology.ttl", format="turtle")
-g.parse("../ontology/sample-data-complex-hybrid.ttl", format="turtle")
+# Declare the ontology and data; DataFrames below are memoized stages and
+# the files are only parsed when a stage's inputs changed
+pipeline = Pipeline([
+    "../ontology/it-infrastructure-ontology.ttl",
+    "../ontology/sample-data-complex-hybrid.ttl",
+])
 
-print(f"✓ Loaded {len(g)} triples")
+print(f"✓ Graph version {pipeline.version[:12]}")
 print(f"  Ontology + Complex Hybrid Architecture")
 
 # ============================================================================
 # CELL 4: Helper Functions
 # ============================================================================
 
-def query_to_dataframe(graph, sparql_query):
-    """Execute SPARQL query and return results as DataFrame."""
-    results = graph.query(sparql_query)
-    data = []
-    for row in results:
-        data.append({str(var): str(row[var]) if row[var] else None 
-                    for var in results.vars})
-    return pd.DataFrame(data)
-
 def get_entity_name(uri):
     """Extract entity name from URI."""
     return str(uri).split('#')[-1].split('/')[-1]
@@ -117,7 +111,7 @@ WHERE {
 ORDER BY ?name
 """
 
-df_apps = query_to_dataframe(g, query_applications)
+df_apps = pipeline.query("apps", query_applications)
 print(f"Found {len(df_apps)} applications:")
 df_apps
 
@@ -145,7 +139,7 @@ WHERE {
 ORDER BY ?location ?name
 """
 
-df_infra = query_to_dataframe(g, query_infrastructure)
+df_infra = pipeline.query("infra", query_infrastructure)
 print(f"Found {len(df_infra)} infrastructure components:")
 df_infra
 
@@ -178,7 +172,7 @@ WHERE {
 ORDER BY ?appName ?relType
 """
 
-df_deps = query_to_dataframe(g, query_dependencies)
+df_deps = pipeline.query("deps", query_dependencies)
 print(f"Found {len(df_deps)} dependencies:")
 df_deps.head(20)
 
@@ -187,7 +181,8 @@ df_deps.head(20)
 # ============================================================================
 
 # Count applications by type
-app_types = df_apps['type'].value_counts()
+app_types = pipeline.stage("app_types", lambda apps: apps['type'].value_counts().to_frame('count'),
+                           inputs=["apps"])['count']
 
 # Create pie chart
 fig = px.pie(values=app_types.values, names=app_types.index,
@@ -201,7 +196,8 @@ fig.show()
 # ============================================================================
 
 # Count infrastructure by location
-location_counts = df_infra['location'].value_counts()
+location_counts = pipeline.stage("location_counts", lambda infra: infra['location'].value_counts().to_frame('count'),
+                                 inputs=["infra"])['count']
 
 # Create bar chart
 fig = px.bar(x=location_counts.index, y=location_counts.values,
@@ -217,10 +213,10 @@ fig.show()
 # ============================================================================
 
 # Calculate total resources by location
-resource_summary = df_infra.groupby('location').agg({
+resource_summary = pipeline.stage("resource_summary", lambda infra: infra.groupby('location').agg({
     'vcpu': 'sum',
     'memory': 'sum'
-}).fillna(0)
+}).fillna(0), inputs=["infra"])
 
 # Create grouped bar chart
 fig = go.Figure(data=[
@@ -293,7 +289,7 @@ WHERE {
 ORDER BY ?business ?app
 """
 
-df_stack = query_to_dataframe(g, query_full_stack)
+df_stack = pipeline.query("stack", query_full_stack)
 print(f"Full stack decomposition ({len(df_stack)} paths):")
 df_stack
 
@@ -318,7 +314,7 @@ WHERE {
 ORDER BY ?type ?name
 """
 
-df_layer4 = query_to_dataframe(g, query_layer4)
+df_layer4 = pipeline.query("layer4", query_layer4)
 print(f"Layer 4 components ({len(df_layer4)} total):")
 df_layer4
 
@@ -349,7 +345,7 @@ WHERE {
 }
 """
 
-df_layer4_rels = query_to_dataframe(g, query_layer4_rels)
+df_layer4_rels = pipeline.query("layer4_rels", query_layer4_rels)
 
 # Prepare network data
 layer4_network = []
@@ -381,18 +377,24 @@ layers = {
     "Security": "SecurityLayer"
 }
 
-for layer_name, layer_class in layers.items():
-    query = f"""
-    PREFIX : <http://example.org/it-infrastructure-ontology#>
-    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-    SELECT (COUNT(DISTINCT ?entity) AS ?count)
-    WHERE {{
-      ?entity a ?type .
-      ?type rdfs:subClassOf* :{layer_class} .
-    }}
-    """
-    result = list(g.query(query))
-    count = int(result[0][0]) if result else 0
+def count_layers(graph, layers):
+    rows = []
+    for layer_name, layer_class in layers.items():
+        query = f"""
+        PREFIX : <http://example.org/it-infrastructure-ontology#>
+        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+        SELECT (COUNT(DISTINCT ?entity) AS ?count)
+        WHERE {{
+          ?entity a ?type .
+          ?type rdfs:subClassOf* :{layer_class} .
+        }}
+        """
+        result = list(graph.query(query))
+        rows.append({"layer": layer_name, "count": int(result[0][0]) if result else 0})
+    return pd.DataFrame(rows)
+
+layer_counts = pipeline.stage("layer_counts", count_layers, params={"layers": layers}, uses_graph=True)
+for layer_name, count in zip(layer_counts["layer"], layer_counts["count"]):
     print(f"{layer_name:20s}: {count:3d} entities")
 
 print("="*60)
@@ -432,3 +434,6 @@ print("✓ CSV files created")
 print("  - applications.csv")
 print("  - infrastructure.csv")
 print("  - dependencies.csv")
+
+# Which stages were recomputed and which came from the cache
+pipeline.report()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Capacity Planning Rollups for IT Infrastructure Ontology
+
+This script extracts the compute properties of physical servers,
+hypervisors, virtual machines, cloud instances and pods into NumPy
+columns and rolls consumption up the runs_on/hosted_on hierarchy:
+- Allocated versus available vCPU and memory for every host
+- Rollups per server, cluster, region and availability zone
+- Consolidation candidates (lightly loaded hosts, query-patterns.md 7.3)
+
+The rollup is a sequence of segment reductions (np.add.at) over the
+hosting edges, one per tree level, instead of per-location pandas
+aggregation after an OPTIONAL-heavy SPARQL query (notebook CELL 10).
+"""
+
+import argparse
+import re
+import sys
+
+import numpy as np
+from rdflib import RDF
+
+from test_queries import ONTO, load_combined_graph, site_of
+
+HOST_CLASSES = [
+    ONTO.PhysicalServer,
+    ONTO.Hypervisor,
+    ONTO.VirtualMachine,
+    ONTO.CloudInstance,
+    ONTO.Pod,
+]
+
+HOSTING_PROPERTIES = [ONTO.runs_on, ONTO.hosted_on]
+
+# Hosts whose location is a data center site rather than a cloud region
+ON_PREMISES_CLASSES = [ONTO.PhysicalServer, ONTO.Hypervisor, ONTO.VirtualMachine]
+
+# Cloud region ("us-east-1") and availability zone ("us-east-1a") names
+CLOUD_REGION = re.compile(r"^[a-z]+(-[a-z]+)+-\d+$")
+CLOUD_ZONE = re.compile(r"^([a-z]+(?:-[a-z]+)+-\d+)[a-z]$")
+
+
+def _number(graph, term, *properties):
+    """First numeric value found for term among properties, or NaN"""
+    for prop in properties:
+        value = graph.value(term, prop)
+        if value is not None:
+            try:
+                return float(value.toPython())
+            except (TypeError, ValueError):
+                continue
+    return np.nan
+
+
+class CapacityModel:
+    """Columnar compute capacity of hosting entities and their hosting edges"""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.entities = []
+        self.index = {}
+        kinds = []
+        for kind, cls in enumerate(HOST_CLASSES):
+            for term in graph.subjects(RDF.type, cls):
+                if term not in self.index:
+                    self.index[term] = len(self.entities)
+                    self.entities.append(term)
+                    kinds.append(kind)
+        self.kind = np.array(kinds, dtype=np.int8)
+
+        # Physical servers report sockets and cores; cores are the
+        # schedulable unit comparable with vcpu_count. Sockets
+        # (cpu_count) are not, so a server with only a socket count has
+        # unknown vCPU capacity
+        self.vcpu = np.array([_number(graph, t, ONTO.vcpu_count, ONTO.cpu_cores)
+                              for t in self.entities], dtype=np.float64)
+        self.memory = np.array([_number(graph, t, ONTO.memory_gb) for t in self.entities],
+                               dtype=np.float64)
+        self.vcpu_known = ~np.isnan(self.vcpu)
+        # Entities without their own sizing (e.g. hypervisors) are transparent:
+        # whatever is allocated on them is passed through to their hosts
+        self.sized = ~(np.isnan(self.vcpu) & np.isnan(self.memory))
+        self.vcpu = np.nan_to_num(self.vcpu)
+        self.memory = np.nan_to_num(self.memory)
+
+        children = []
+        parents = []
+        for prop in HOSTING_PROPERTIES:
+            for s, o in graph.subject_objects(prop):
+                if s in self.index and o in self.index and s != o:
+                    children.append(self.index[s])
+                    parents.append(self.index[o])
+        self.child = np.array(children, dtype=np.int64)
+        self.parent = np.array(parents, dtype=np.int64)
+
+        # A workload spread over k hosts (e.g. a hypervisor cluster on
+        # three servers) charges 1/k of its demand to each of them
+        fan_out = np.bincount(self.child, minlength=len(self.entities)) if len(self.child) else \
+            np.zeros(len(self.entities), dtype=np.int64)
+        self.weight = 1.0 / np.maximum(fan_out[self.child], 1)
+        self.is_root = fan_out == 0
+
+        # Edges grouped by parent (CSR): the edges onto node are
+        # edge_order[edge_start[node]:edge_start[node + 1]]
+        self.edge_order = np.argsort(self.parent, kind="stable")
+        self.edge_start = np.searchsorted(self.parent[self.edge_order], np.arange(len(self.entities) + 1))
+
+        self.height = self._heights()
+
+    def _heights(self):
+        """Longest distance from each entity down to a hosted leaf"""
+        height = np.zeros(len(self.entities), dtype=np.int64)
+        for _ in range(len(self.entities)):
+            candidate = height.copy()
+            np.maximum.at(candidate, self.parent, height[self.child] + 1)
+            if np.array_equal(candidate, height):
+                break
+            height = candidate
+        return height
+
+    def rollup(self):
+        """Return (allocated_vcpu, allocated_memory) per entity
+
+        Edges are reduced level by level from the leaves upwards, so a
+        transparent host forwards the complete load placed on it.
+        """
+        n = len(self.entities)
+        allocated_vcpu = np.zeros(n)
+        allocated_memory = np.zeros(n)
+        if not len(self.child):
+            return allocated_vcpu, allocated_memory
+
+        edge_height = self.height[self.child]
+        for level in range(int(edge_height.max()) + 1):
+            mask = edge_height == level
+            child = self.child[mask]
+            parent = self.parent[mask]
+            weight = self.weight[mask]
+            sized = self.sized[child]
+            demand_vcpu = np.where(sized, self.vcpu[child], allocated_vcpu[child])
+            demand_memory = np.where(sized, self.memory[child], allocated_memory[child])
+            np.add.at(allocated_vcpu, parent, weight * demand_vcpu)
+            np.add.at(allocated_memory, parent, weight * demand_memory)
+        return allocated_vcpu, allocated_memory
+
+    def group_keys(self, dimension):
+        """Group label per entity for server/cluster/region/availability_zone"""
+        graph = self.graph
+        if dimension == "server":
+            return [str(graph.value(t, ONTO.name) or t) for t in self.entities]
+        if dimension == "region":
+            return [str(graph.value(t, ONTO.region) or self._location_key(i, "region"))
+                    for i, t in enumerate(self.entities)]
+        if dimension == "availability_zone":
+            return [str(graph.value(t, ONTO.availability_zone) or self._location_key(i, "availability_zone"))
+                    for i, t in enumerate(self.entities)]
+        if dimension == "cluster":
+            return [self._cluster_of(i) for i in range(len(self.entities))]
+        raise ValueError(f"Unknown rollup dimension: {dimension}")
+
+    def _location_key(self, node, dimension):
+        """Region or availability zone of a host without that property, from its location
+
+        A zone-shaped location ("us-east-1a") is the zone of a cloud
+        region; on-premises hosts are grouped by their site (the
+        location without rack and slot). Anything else is "unknown".
+        """
+        location = self.graph.value(self.entities[node], ONTO.location)
+        if location is None:
+            return "unknown"
+        location = str(location)
+        zone = CLOUD_ZONE.match(location)
+        if zone:
+            return zone.group(1) if dimension == "region" else location
+        if CLOUD_REGION.match(location):
+            return location if dimension == "region" else "unknown"
+        if HOST_CLASSES[self.kind[node]] in ON_PREMISES_CLASSES:
+            return site_of(location)
+        return "unknown"
+
+    def _cluster_of(self, node):
+        """Cluster a host belongs to: the hypervisor or Kubernetes cluster above it"""
+        graph = self.graph
+        for edge in self.edge_order[self.edge_start[node]:self.edge_start[node + 1]]:
+            child = self.entities[self.child[edge]]
+            if self.kind[self.child[edge]] == HOST_CLASSES.index(ONTO.Hypervisor):
+                return str(graph.value(child, ONTO.name) or child)
+            for namespace in graph.objects(child, ONTO.runs_in):
+                for cluster in graph.objects(namespace, ONTO.part_of):
+                    if (cluster, RDF.type, ONTO.Cluster) in graph:
+                        return str(graph.value(cluster, ONTO.name) or cluster)
+        return "unclustered"
+
+
+def capacity_rollups(model, dimensions=("server", "cluster", "region", "availability_zone")):
+    """Aggregate allocated versus available capacity of the root hosts
+
+    Only root hosts (those not hosted on anything else) carry available
+    capacity, so each unit of hardware is counted exactly once. A group
+    with a host of unknown vCPU capacity has NaN available vCPU.
+    """
+    allocated_vcpu, allocated_memory = model.rollup()
+    roots = np.flatnonzero(model.is_root & model.sized & (model.kind != HOST_CLASSES.index(ONTO.Pod)))
+
+    results = {}
+    for dimension in dimensions:
+        keys = model.group_keys(dimension)
+        labels, codes = np.unique([keys[i] for i in roots], return_inverse=True)
+        size = len(labels)
+        results[dimension] = {
+            "group": labels,
+            "hosts": np.bincount(codes, minlength=size),
+            "available_vcpu": np.where(
+                np.bincount(codes, weights=~model.vcpu_known[roots], minlength=size) > 0, np.nan,
+                np.bincount(codes, weights=model.vcpu[roots], minlength=size)),
+            "allocated_vcpu": np.bincount(codes, weights=allocated_vcpu[roots], minlength=size),
+            "available_memory": np.bincount(codes, weights=model.memory[roots], minlength=size),
+            "allocated_memory": np.bincount(codes, weights=allocated_memory[roots], minlength=size),
+        }
+    return results
+
+
+def consolidation_candidates(model, threshold=0.25):
+    """Sized hosts whose vCPU and memory allocation are both below threshold
+
+    Hosts carrying no sized workload at all, or with unknown vCPU
+    capacity, are skipped: their load is unknown rather than low.
+    """
+    allocated_vcpu, allocated_memory = model.rollup()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cpu_ratio = np.where(model.vcpu > 0, allocated_vcpu / model.vcpu, 0.0)
+        # Unknown capacity never makes a host look lightly loaded
+        cpu_ratio[~model.vcpu_known] = np.nan
+        memory_ratio = np.where(model.memory > 0, allocated_memory / model.memory, 0.0)
+    hosts = model.kind != HOST_CLASSES.index(ONTO.Pod)
+    loaded = (allocated_vcpu > 0) | (allocated_memory > 0)
+    mask = hosts & model.sized & loaded & (cpu_ratio < threshold) & (memory_ratio < threshold)
+    return [(model.entities[i], cpu_ratio[i], memory_ratio[i]) for i in np.flatnonzero(mask)]
+
+
+def main():
+    """Main capacity planning function"""
+    parser = argparse.ArgumentParser(description="Capacity rollups along the hosting hierarchy")
+    parser.add_argument("files", nargs="*", help="Turtle files to load (default: ontology and sample data)")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Utilization below which a host is a consolidation candidate")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("IT Infrastructure Ontology - Capacity Planning")
+    print("="*70)
+
+    graph = load_combined_graph(args.files or None)
+    model = CapacityModel(graph)
+    print(f"\nHosting entities: {len(model.entities)}, hosting edges: {len(model.child)}")
+
+    for dimension, table in capacity_rollups(model).items():
+        print(f"\n{'='*70}")
+        print(f"CAPACITY BY {dimension.upper().replace('_', ' ')}")
+        print(f"{'='*70}")
+        print(f"{'Group':<40} {'Hosts':>5} {'vCPU used/avail':>17} {'Memory GB used/avail':>22}")
+        print(f"{'-'*86}")
+        for i, group in enumerate(table["group"]):
+            available = table['available_vcpu'][i]
+            vcpu = f"{table['allocated_vcpu'][i]:.1f}/{'?' if np.isnan(available) else f'{available:.0f}'}"
+            memory = f"{table['allocated_memory'][i]:.1f}/{table['available_memory'][i]:.0f}"
+            print(f"{group[:39]:<40} {table['hosts'][i]:>5} {vcpu:>17} {memory:>22}")
+
+    print(f"\n{'='*70}")
+    print(f"CONSOLIDATION CANDIDATES (< {args.threshold:.0%} allocated)")
+    print(f"{'='*70}")
+    for term, cpu_ratio, memory_ratio in consolidation_candidates(model, args.threshold):
+        name = graph.value(term, ONTO.name) or term
+        print(f"  {str(name):<40} vCPU {cpu_ratio:>6.1%}  memory {memory_ratio:>6.1%}")
+
+    sys.exit(0)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nCapacity planning interrupted by user.")
+        sys.exit(130)
+    except Exception as e:
+        print(f"\n[ERROR] Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
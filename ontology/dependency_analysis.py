@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Single Point of Failure Analysis for IT Infrastructure Ontology
+
+This script builds the cross-layer dependency graph once and computes:
+- Dominators of each business process's infrastructure (per-process SPOFs)
+- Articulation points and bridges of the undirected dependency graph
+- A ranking of components by the number of business processes they can take down
+
+It replaces running one impact query (query-patterns.md 2.1-2.6) per
+candidate component with a single near-linear pass over the estate.
+"""
+
+import argparse
+import sys
+from collections import defaultdict
+
+from rdflib import RDF
+
+from test_queries import ONTO, load_combined_graph
+
+# Relationships followed from a dependent entity to the entity it relies on.
+# communicates_via and uses are included so that routes_through and stored_on
+# edges are reachable from the applications that realize a business process.
+DEPENDENCY_PROPERTIES = [
+    "realized_by",
+    "deployed_as",
+    "hosted_on",
+    "runs_on",
+    "uses",
+    "communicates_via",
+    "stored_on",
+    "allocated_from",
+    "routes_through",
+    "connected_to",
+]
+
+# Peer relationships: followed in both directions, but an entity whose only
+# outgoing edges are peer edges is still a leaf of the hosting hierarchy
+SYMMETRIC_PROPERTIES = {"connected_to"}
+
+
+class DependencyGraph:
+    """Integer-indexed adjacency lists over the cross-layer dependency edges"""
+
+    def __init__(self):
+        self.nodes = []
+        self.index = {}
+        self.successors = []
+        self.predecessors = []
+        self.hosting_degree = []
+        self._edges = set()
+
+    def add_node(self, term):
+        """Return the integer id of term, registering it if needed"""
+        node_id = self.index.get(term)
+        if node_id is None:
+            node_id = len(self.nodes)
+            self.index[term] = node_id
+            self.nodes.append(term)
+            self.successors.append([])
+            self.predecessors.append([])
+            self.hosting_degree.append(0)
+        return node_id
+
+    def add_edge(self, source, target, symmetric=False):
+        """Add a dependency edge source -> target (ignoring duplicates)"""
+        s = self.add_node(source)
+        t = self.add_node(target)
+        if (s, t) in self._edges:
+            return
+        self._edges.add((s, t))
+        self.successors[s].append(t)
+        self.predecessors[t].append(s)
+        if not symmetric:
+            self.hosting_degree[s] += 1
+
+    @property
+    def edge_count(self):
+        return len(self._edges)
+
+    def is_leaf(self, node_id):
+        """True when the node does not rely on any further hosting entity"""
+        return self.hosting_degree[node_id] == 0
+
+    @classmethod
+    def from_graph(cls, graph, properties=DEPENDENCY_PROPERTIES):
+        """Build the dependency graph from an rdflib graph in one pass per property"""
+        dep = cls()
+        for prop in properties:
+            symmetric = prop in SYMMETRIC_PROPERTIES
+            for s, o in graph.subject_objects(ONTO[prop]):
+                dep.add_edge(s, o, symmetric)
+                if symmetric:
+                    dep.add_edge(o, s, symmetric)
+        return dep
+
+
+def immediate_dominators(root, successors):
+    """Compute immediate dominators of every node reachable from root
+
+    Iterative Lengauer-Tarjan with path compression. successors is a
+    callable returning the successor ids of a node; the result maps each
+    reachable node (except root) to its immediate dominator.
+    """
+    # Depth-first numbering
+    dfn = {root: 0}
+    vertex = [root]
+    parent = [-1]
+    stack = [(root, iter(successors(root)))]
+    while stack:
+        v, children = stack[-1]
+        for w in children:
+            if w not in dfn:
+                dfn[w] = len(vertex)
+                vertex.append(w)
+                parent.append(dfn[v])
+                stack.append((w, iter(successors(w))))
+                break
+        else:
+            stack.pop()
+
+    n = len(vertex)
+    preds = [[] for _ in range(n)]
+    for v in range(n):
+        for w in successors(vertex[v]):
+            preds[dfn[w]].append(v)
+
+    semi = list(range(n))
+    label = list(range(n))
+    ancestor = [-1] * n
+    idom = [0] * n
+    bucket = [[] for _ in range(n)]
+
+    def evaluate(v):
+        if ancestor[v] == -1:
+            return v
+        path = []
+        u = v
+        while ancestor[ancestor[u]] != -1:
+            path.append(u)
+            u = ancestor[u]
+        for u in reversed(path):
+            a = ancestor[u]
+            if semi[label[a]] < semi[label[u]]:
+                label[u] = label[a]
+            ancestor[u] = ancestor[a]
+        return label[v]
+
+    for w in range(n - 1, 0, -1):
+        for v in preds[w]:
+            u = evaluate(v)
+            if semi[u] < semi[w]:
+                semi[w] = semi[u]
+        bucket[semi[w]].append(w)
+        p = parent[w]
+        ancestor[w] = p
+        for v in bucket[p]:
+            u = evaluate(v)
+            idom[v] = u if semi[u] < semi[v] else p
+        bucket[p] = []
+
+    for w in range(1, n):
+        if idom[w] != semi[w]:
+            idom[w] = idom[idom[w]]
+
+    return {vertex[w]: vertex[idom[w]] for w in range(1, n)}
+
+
+def infrastructure_dominators(dep, root):
+    """Return the components whose failure cuts root off from all of its leaves
+
+    A virtual sink is attached to every leaf reachable from root; the
+    dominators of that sink are exactly the single points of failure.
+    """
+    sink = -1
+
+    def successors(v):
+        if v == sink:
+            return []
+        if dep.is_leaf(v) and v != root:
+            return dep.successors[v] + [sink]
+        return dep.successors[v]
+
+    idom = immediate_dominators(root, successors)
+    if sink not in idom:
+        return []
+
+    chain = []
+    node = idom[sink]
+    while node != root:
+        chain.append(node)
+        node = idom[node]
+    return chain
+
+
+def articulation_points_and_bridges(dep):
+    """Find cut vertices and cut edges of the undirected dependency graph
+
+    Iterative Tarjan low-link, linear in nodes plus edges.
+    """
+    neighbours = [set() for _ in dep.nodes]
+    for s, t in dep._edges:
+        if s != t:
+            neighbours[s].add(t)
+            neighbours[t].add(s)
+    neighbours = [list(adj) for adj in neighbours]
+
+    n = len(dep.nodes)
+    disc = [-1] * n
+    low = [0] * n
+    articulation = set()
+    bridges = []
+    timer = 0
+
+    for start in range(n):
+        if disc[start] != -1:
+            continue
+        disc[start] = low[start] = timer
+        timer += 1
+        root_children = 0
+        stack = [(start, -1, iter(neighbours[start]))]
+        while stack:
+            v, parent, children = stack[-1]
+            advanced = False
+            for w in children:
+                if w == parent:
+                    continue
+                if disc[w] == -1:
+                    disc[w] = low[w] = timer
+                    timer += 1
+                    if v == start:
+                        root_children += 1
+                    stack.append((w, v, iter(neighbours[w])))
+                    advanced = True
+                    break
+                low[v] = min(low[v], disc[w])
+            if advanced:
+                continue
+            stack.pop()
+            if parent != -1:
+                low[parent] = min(low[parent], low[v])
+                if low[v] > disc[parent]:
+                    bridges.append((parent, v))
+                if parent != start and low[v] >= disc[parent]:
+                    articulation.add(parent)
+        if root_children > 1:
+            articulation.add(start)
+
+    return articulation, bridges
+
+
+def find_single_points_of_failure(graph, dep=None):
+    """Rank every component whose failure isolates at least one business process
+
+    Returns a list of (component, [business processes]) sorted by the
+    number of affected processes, most damaging first.
+    """
+    if dep is None:
+        dep = DependencyGraph.from_graph(graph)
+
+    affected = defaultdict(list)
+    for process in graph.subjects(RDF.type, ONTO.BusinessProcess):
+        root = dep.index.get(process)
+        if root is None:
+            continue
+        for node_id in infrastructure_dominators(dep, root):
+            affected[dep.nodes[node_id]].append(process)
+
+    return sorted(affected.items(), key=lambda item: (-len(item[1]), str(item[0])))
+
+
+def describe(graph, term):
+    """Human-readable label for an entity: name and local type"""
+    name = graph.value(term, ONTO.name) or str(term).split('#')[-1]
+    entity_type = graph.value(term, RDF.type)
+    type_name = str(entity_type).split('#')[-1] if entity_type else "?"
+    return f"{name} ({type_name})"
+
+
+def main():
+    """Main analysis function"""
+    parser = argparse.ArgumentParser(description="Estate-wide single point of failure analysis")
+    parser.add_argument("files", nargs="*", help="Turtle files to load (default: ontology and sample data)")
+    parser.add_argument("--top", type=int, default=20, help="Number of ranked components to print")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("IT Infrastructure Ontology - Single Point of Failure Analysis")
+    print("="*70)
+
+    graph = load_combined_graph(args.files or None)
+
+    dep = DependencyGraph.from_graph(graph)
+    print(f"\nDependency graph: {len(dep.nodes)} nodes, {dep.edge_count} edges")
+
+    ranking = find_single_points_of_failure(graph, dep)
+    articulation, bridges = articulation_points_and_bridges(dep)
+
+    print(f"\n{'='*70}")
+    print("SINGLE POINTS OF FAILURE (ranked by affected business processes)")
+    print(f"{'='*70}")
+    if not ranking:
+        print("[OK] No component isolates a business process from its infrastructure")
+    for component, processes in ranking[:args.top]:
+        print(f"\n  {describe(graph, component)}: {len(processes)} process(es)")
+        for process in sorted(processes, key=str):
+            print(f"    - {describe(graph, process)}")
+
+    print(f"\n{'='*70}")
+    print("GRAPH STRUCTURE")
+    print(f"{'='*70}")
+    print(f"  Articulation points: {len(articulation)}")
+    print(f"  Bridges: {len(bridges)}")
+    for s, t in bridges[:args.top]:
+        print(f"    {describe(graph, dep.nodes[s])} -- {describe(graph, dep.nodes[t])}")
+
+    sys.exit(0)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nAnalysis interrupted by user.")
+        sys.exit(130)
+    except Exception as e:
+        print(f"\n[ERROR] Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Entity Search Indexes for IT Infrastructure Ontology
+
+This script maintains secondary indexes over the data properties that
+troubleshooting queries start from, instead of scanning literal objects:
+- An exact hash index over name, ip_address, instance_id and other IDs
+- A trigram index over names for substring and fuzzy search
+- Sorted IP address/CIDR lists for prefix search ("10.100.")
+
+Indexes are updated by add()/remove(), which write through to the graph.
+register_sparql_functions() makes them available in SPARQL, e.g.
+BIND(idx:entity("name", "Order API") AS ?app).
+"""
+
+import argparse
+import sys
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+from rdflib import Literal, Namespace
+from rdflib.plugins.sparql import prepareQuery
+from rdflib.plugins.sparql.operators import register_custom_function, unregister_custom_function
+from rdflib.plugins.sparql.sparql import SPARQLError
+
+from test_queries import ONTO, load_combined_graph
+
+IDX = Namespace("http://example.org/it-infrastructure-ontology/index#")
+
+# Data properties with an exact index
+EXACT_PROPERTIES = ("name", "ip_address", "instance_id", "vm_id", "serial_number",
+                    "mac_address", "cidr_block")
+
+# Data properties with a trigram index and with a prefix index
+TRIGRAM_PROPERTIES = ("name",)
+PREFIX_PROPERTIES = ("ip_address", "cidr_block")
+
+
+def trigrams(text):
+    """Lower-cased trigrams of text, padded so short words still have some"""
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class EntityIndex:
+    """Exact, trigram and prefix indexes over selected data properties"""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self._properties = {ONTO[p]: p for p in EXACT_PROPERTIES}
+        self.exact = defaultdict(set)
+        self.values = defaultdict(set)
+        self.postings = defaultdict(set)
+        self.sorted_values = {p: [] for p in PREFIX_PROPERTIES}
+        for prop_iri, prop in self._properties.items():
+            for s, o in graph.subject_objects(prop_iri):
+                self._index(s, prop, str(o))
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _index(self, subject, prop, value):
+        self.values[(subject, prop)].add(value)
+        subjects = self.exact[(prop, value)]
+        if subjects:
+            subjects.add(subject)
+            return
+        subjects.add(subject)
+        if prop in TRIGRAM_PROPERTIES:
+            for gram in trigrams(value):
+                self.postings[gram].add(value)
+        if prop in PREFIX_PROPERTIES:
+            insort(self.sorted_values[prop], value)
+
+    def _unindex(self, subject, prop, value):
+        values = self.values.get((subject, prop))
+        if values is not None:
+            values.discard(value)
+            if not values:
+                del self.values[(subject, prop)]
+        subjects = self.exact.get((prop, value))
+        if not subjects:
+            return
+        subjects.discard(subject)
+        if subjects:
+            return
+        del self.exact[(prop, value)]
+        if prop in TRIGRAM_PROPERTIES:
+            for gram in trigrams(value):
+                self.postings[gram].discard(value)
+                if not self.postings[gram]:
+                    del self.postings[gram]
+        if prop in PREFIX_PROPERTIES:
+            values = self.sorted_values[prop]
+            del values[bisect_left(values, value)]
+
+    def add(self, triple):
+        """Add a triple to the graph and to the indexes"""
+        self.graph.add(triple)
+        s, p, o = triple
+        if p in self._properties and isinstance(o, Literal):
+            self._index(s, self._properties[p], str(o))
+
+    def remove(self, triple):
+        """Remove a triple (or pattern) from the graph and from the indexes"""
+        for s, p, o in list(self.graph.triples(triple)):
+            self.graph.remove((s, p, o))
+            if p in self._properties and isinstance(o, Literal):
+                # The same lexical value may remain with another datatype
+                if not any(str(other) == str(o) for other in self.graph.objects(s, p)):
+                    self._unindex(s, self._properties[p], str(o))
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def lookup(self, prop, value):
+        """Entities whose prop equals value exactly"""
+        return sorted(self.exact.get((prop, str(value)), ()), key=str)
+
+    def values_of(self, subject, prop):
+        """Indexed values of prop on one subject"""
+        return self.values.get((subject, prop), ())
+
+    def _entities(self, prop, values):
+        found = set()
+        for value in values:
+            found |= self.exact.get((prop, value), set())
+        return sorted(found, key=str)
+
+    def contains(self, text, prop="name"):
+        """Entities whose prop contains text (case-insensitive)"""
+        needle = text.lower()
+        if len(needle) >= 3 and prop in TRIGRAM_PROPERTIES:
+            grams = [needle[i:i + 3] for i in range(len(needle) - 2)]
+            candidates = set.intersection(*(self.postings.get(g, set()) for g in grams))
+        else:
+            candidates = {value for p, value in self.exact if p == prop}
+        return self._entities(prop, (v for v in candidates if needle in v.lower()))
+
+    def similar(self, text, limit=5, threshold=0.3):
+        """(entity, name, score) ranked by trigram similarity, for misspelled names"""
+        query = trigrams(text)
+        shared = defaultdict(int)
+        for gram in query:
+            for value in self.postings.get(gram, ()):
+                shared[value] += 1
+        scored = []
+        for value, common in shared.items():
+            score = common / (len(query) + len(trigrams(value)) - common)
+            if score >= threshold:
+                scored.append((score, value))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        results = []
+        for score, value in scored:
+            for entity in self.lookup("name", value):
+                results.append((entity, value, score))
+        return results[:limit]
+
+    def prefix(self, prefix, prop="ip_address"):
+        """Entities whose prop starts with prefix, e.g. prefix("10.100.")"""
+        values = self.sorted_values[prop]
+        start = bisect_left(values, prefix)
+        end = start
+        while end < len(values) and values[end].startswith(prefix):
+            end += 1
+        return self._entities(prop, values[start:end])
+
+    # ------------------------------------------------------------------
+    # SPARQL
+    # ------------------------------------------------------------------
+
+    def register_sparql_functions(self):
+        """Expose the indexes as idx: SPARQL functions (see module docstring)
+
+        idx:entity(prop, value)      entity with prop = value
+        idx:similarName(text)        best fuzzy name match
+        idx:nameContains(?e, text)   true when ?e's name contains text
+        idx:ipPrefix(?e, prefix)     true when ?e's ip_address starts with prefix
+
+        A SPARQL function returns a single term, so when several entities
+        share a value (duplicate names) idx:entity binds the first in IRI
+        order only; use idx:nameContains/idx:ipPrefix as filters, or
+        lookup(), to get all of them. The filters test only the values
+        of ?e itself.
+        """
+        def first(entities):
+            if not entities:
+                raise SPARQLError("No indexed entity")
+            return entities[0]
+
+        def entity(prop, value):
+            return first(self.lookup(str(prop), str(value)))
+
+        def similar_name(text):
+            return first([e for e, _, _ in self.similar(str(text), limit=1)])
+
+        def name_contains(term, text):
+            needle = str(text).lower()
+            return Literal(any(needle in value.lower() for value in self.values_of(term, "name")))
+
+        def ip_prefix(term, prefix):
+            prefix = str(prefix)
+            return Literal(any(value.startswith(prefix) for value in self.values_of(term, "ip_address")))
+
+        self._functions = {
+            IDX.entity: entity,
+            IDX.similarName: similar_name,
+            IDX.nameContains: name_contains,
+            IDX.ipPrefix: ip_prefix,
+        }
+        for uri, func in self._functions.items():
+            register_custom_function(uri, func, override=True)
+
+    def unregister_sparql_functions(self):
+        for uri, func in getattr(self, "_functions", {}).items():
+            unregister_custom_function(uri, func)
+        self._functions = {}
+
+
+def _microseconds(func, repeat=1000):
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start_time) / repeat * 1e6
+
+
+def main():
+    """Main entity search function"""
+    parser = argparse.ArgumentParser(description="Indexed entity search by name and attributes")
+    parser.add_argument("files", nargs="*", help="Turtle files to load (default: ontology and sample data)")
+    parser.add_argument("--name", default="Order API", help="Exact name to look up")
+    parser.add_argument("--contains", default="order", help="Substring to search for in names")
+    parser.add_argument("--similar", default="Ordr Servce", help="Misspelled name for fuzzy search")
+    parser.add_argument("--ip-prefix", default="10.", help="IP address prefix to search for")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("IT Infrastructure Ontology - Entity Search Indexes")
+    print("="*70)
+
+    graph = load_combined_graph(args.files or None)
+    start_time = time.time()
+    index = EntityIndex(graph)
+    print(f"\n[OK] Indexed {len(index.exact)} values ({len(index.postings)} trigrams) "
+          f"in {(time.time() - start_time)*1000:.1f} ms")
+
+    def show(title, entities):
+        print(f"\n{title}: {len(entities)}")
+        for entity in entities[:10]:
+            print(f"  {graph.value(entity, ONTO.name) or entity}  <{entity}>")
+
+    show(f"Exact name \"{args.name}\"", index.lookup("name", args.name))
+    show(f"Names containing \"{args.contains}\"", index.contains(args.contains))
+    show(f"IP addresses starting with \"{args.ip_prefix}\"", index.prefix(args.ip_prefix))
+    print(f"\nNames similar to \"{args.similar}\":")
+    for entity, value, score in index.similar(args.similar):
+        print(f"  {value:<40} {score:.2f}")
+
+    print(f"\n{'='*70}")
+    print("LOOKUP LATENCY")
+    print(f"{'='*70}")
+    # Prepared, so that the timings exclude SPARQL parsing
+    exact_query = prepareQuery(
+        "SELECT ?entity WHERE { ?entity :name ?value . }", initNs={"": ONTO})
+    indexed_query = prepareQuery(
+        "SELECT ?entity WHERE { BIND(idx:entity(\"name\", ?value) AS ?entity) }", initNs={"idx": IDX})
+    contains_query = prepareQuery(
+        "SELECT ?entity WHERE { ?entity :name ?name . FILTER(CONTAINS(LCASE(?name), LCASE(?text))) }",
+        initNs={"": ONTO})
+    name, text = Literal(args.name), Literal(args.contains)
+
+    index.register_sparql_functions()
+    try:
+        timings = [
+            ("SPARQL :name match", lambda: list(graph.query(exact_query, initBindings={"value": name}))),
+            ("SPARQL idx:entity()", lambda: list(graph.query(indexed_query, initBindings={"value": name}))),
+            ("SPARQL CONTAINS filter", lambda: list(graph.query(contains_query, initBindings={"text": text}))),
+            ("Python lookup()", lambda: index.lookup("name", args.name)),
+            ("Python contains()", lambda: index.contains(args.contains)),
+            ("Python similar()", lambda: index.similar(args.similar)),
+            ("Python prefix()", lambda: index.prefix(args.ip_prefix)),
+        ]
+        for title, func in timings:
+            repeat = 20 if title.startswith("SPARQL") else 1000
+            print(f"  {title:<24} {_microseconds(func, repeat):>10.1f} us")
+        scanned = {row[0] for row in graph.query(contains_query, initBindings={"text": text})}
+    finally:
+        index.unregister_sparql_functions()
+
+    consistent = scanned == set(index.contains(args.contains))
+    if consistent:
+        print("\n[OK] Index substring search agrees with the SPARQL CONTAINS scan")
+    else:
+        print("\n[ERROR] Index substring search disagrees with the SPARQL CONTAINS scan")
+    sys.exit(0 if consistent else 1)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nSearch interrupted by user.")
+        sys.exit(130)
+    except Exception as e:
+        print(f"\n[ERROR] Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
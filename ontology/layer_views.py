@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Layer-Projected Subgraph Views for IT Infrastructure Ontology
+
+This script provides named, read-only views of the loaded graph:
+- Per layer (layer 4 supersedes the hand-made layer4-only.ttl extract,
+  and also covers the ApplicationServer instances it leaves out)
+- Per cloud_provider, region or location, and intersections of these
+- Queryable with SPARQL and serializable on demand
+
+A view copies no triples. Entities are numbered append-only and every
+filter is a packed membership bitmap over those numbers; a view keeps its
+filters and looks their bitmaps up in the catalog on every access, then
+filters the underlying store by the subject's bit. Layer membership is
+computed from the subclass closure once, instead of rdfs:subClassOf* per
+query (notebook CELLs 13-14).
+
+Updates made through ViewCatalog.add()/remove()/set() write through to
+the graph and flip the affected bits, so existing views stay current.
+After editing the graph directly, call ViewCatalog.refresh().
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+from rdflib import Graph, Literal, RDF, RDFS
+from rdflib.graph import ModificationException
+from rdflib.store import Store
+
+from reasoner import superclass_closure
+from test_queries import ONTO, load_combined_graph
+
+LAYERS = {
+    1: ONTO.BusinessProcessLayer,
+    2: ONTO.ApplicationLayer,
+    3: ONTO.ContainerLayer,
+    4: ONTO.PhysicalInfrastructureLayer,
+    5: ONTO.NetworkLayer,
+    6: ONTO.SecurityLayer,
+}
+
+# Data properties a view can be filtered on
+VIEW_PROPERTIES = ("cloud_provider", "region", "location", "availability_zone")
+
+
+class ProjectedStore(Store):
+    """Read-only store exposing the triples of member subjects only"""
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, catalog, filters):
+        super().__init__()
+        self.catalog = catalog
+        self.filters = filters
+
+    def triples(self, triple_pattern, context=None):
+        bitmap = self.catalog.resolve(self.filters)
+        member = self.catalog.member
+        subject = triple_pattern[0]
+        if subject is not None and not member(bitmap, subject):
+            return
+        for triple in self.catalog.graph.triples(triple_pattern):
+            if subject is not None or member(bitmap, triple[0]):
+                yield triple, iter(())
+
+    def __len__(self, context=None):
+        return sum(1 for _ in self.triples((None, None, None)))
+
+    def namespaces(self):
+        return self.catalog.graph.namespaces()
+
+    def namespace(self, prefix):
+        return self.catalog.graph.store.namespace(prefix)
+
+    def prefix(self, namespace):
+        return self.catalog.graph.store.prefix(namespace)
+
+    def bind(self, prefix, namespace, override=True):
+        pass
+
+    def add(self, triple, context=None, quoted=False):
+        raise ModificationException()
+
+    def remove(self, triple, context=None):
+        raise ModificationException()
+
+
+class ViewCatalog:
+    """Entity numbering plus lazily built membership bitmaps over one graph"""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.entities = []
+        self.index = {}
+        self.refresh()
+
+    def refresh(self):
+        """Number new entities and drop cached bitmaps (after direct graph edits)
+
+        Numbers are never reassigned, so views created earlier remain valid.
+        """
+        for subject in sorted(set(self.graph.subjects()) - self.index.keys(), key=str):
+            self._number(subject)
+        self._bitmaps = {}
+        self._filters = {}
+        self._intersections = {}
+        self._compute_layers()
+
+    def _number(self, term):
+        node_id = self.index.get(term)
+        if node_id is None:
+            node_id = len(self.entities)
+            self.index[term] = node_id
+            self.entities.append(term)
+        return node_id
+
+    def _compute_layers(self):
+        superclasses = superclass_closure(self.graph)
+        self._layer_of_class = {}
+        for cls, ancestors in superclasses.items():
+            for number, layer in LAYERS.items():
+                if layer in ancestors:
+                    self._layer_of_class[cls] = number
+        for number, layer in LAYERS.items():
+            self._layer_of_class[layer] = number
+
+    # ------------------------------------------------------------------
+    # Write-through updates
+    # ------------------------------------------------------------------
+
+    def add(self, triple):
+        """Add a triple to the graph and update the affected bitmaps"""
+        self.graph.add(triple)
+        self._number(triple[0])
+        self._apply(triple)
+
+    def remove(self, triple):
+        """Remove a triple (or pattern) from the graph and update the affected bitmaps"""
+        for removed in list(self.graph.triples(triple)):
+            self.graph.remove(removed)
+            self._apply(removed)
+
+    def set(self, triple):
+        """Replace the objects of (subject, predicate), like Graph.set()"""
+        subject, predicate, _ = triple
+        self.remove((subject, predicate, None))
+        self.add(triple)
+
+    def _apply(self, triple):
+        s, p, _ = triple
+        if p == RDFS.subClassOf:
+            # The layer of every class below may have changed
+            self._compute_layers()
+            for cache_key in [k for k in self._bitmaps if k[0] == "layer"]:
+                del self._bitmaps[cache_key]
+            self._intersections = {}
+            return
+        if p != RDF.type and p not in {ONTO[key] for key in VIEW_PROPERTIES}:
+            return
+        node_id = self._number(s)
+        changed = False
+        for cache_key, (key, value) in self._filters.items():
+            if cache_key not in self._bitmaps:
+                continue
+            bits = self._bitmaps[cache_key]
+            if len(bits) <= node_id >> 3:
+                bits.extend(bytes((node_id >> 3) + 1 - len(bits)))
+            mask = 1 << (7 - (node_id & 7))
+            if self._is_member(s, key, value):
+                changed |= not bits[node_id >> 3] & mask
+                bits[node_id >> 3] |= mask
+            else:
+                changed |= bool(bits[node_id >> 3] & mask)
+                bits[node_id >> 3] &= ~mask & 0xFF
+        if changed:
+            self._intersections = {}
+
+    # ------------------------------------------------------------------
+    # Bitmaps
+    # ------------------------------------------------------------------
+
+    def _is_member(self, subject, key, value):
+        if key == "layer":
+            return any(self._layer_of_class.get(cls) == value
+                       for cls in self.graph.objects(subject, RDF.type))
+        return (subject, ONTO[key], Literal(value)) in self.graph
+
+    def _pack(self, members):
+        mask = np.zeros(len(self.entities), dtype=bool)
+        ids = [self.index[m] for m in members if m in self.index]
+        mask[ids] = True
+        return bytearray(np.packbits(mask).tobytes())
+
+    def bitmap(self, key, value):
+        """Packed membership bitmap for one dimension, computed on first use"""
+        cache_key = (key, str(value))
+        if cache_key not in self._bitmaps:
+            if key == "layer":
+                members = {s for s, cls in self.graph.subject_objects(RDF.type)
+                           if self._layer_of_class.get(cls) == value}
+            elif key in VIEW_PROPERTIES:
+                members = set(self.graph.subjects(ONTO[key], Literal(value)))
+            else:
+                raise ValueError(f"Unknown view dimension: {key}")
+            self._filters[cache_key] = (key, value)
+            self._bitmaps[cache_key] = self._pack(members)
+        return self._bitmaps[cache_key]
+
+    def resolve(self, filters):
+        """Current bitmap of the intersection of filters, a tuple of (key, value)"""
+        bitmap = self._intersections.get(filters)
+        if bitmap is None:
+            parts = [self.bitmap(key, value) for key, value in filters]
+            if len(parts) == 1:
+                bitmap = parts[0]
+            else:
+                size = min(len(part) for part in parts)
+                arrays = [np.frombuffer(part, dtype=np.uint8, count=size) for part in parts]
+                bitmap = np.bitwise_and.reduce(arrays).tobytes()
+            self._intersections[filters] = bitmap
+        return bitmap
+
+    def member(self, bitmap, term):
+        """Whether term's bit is set in bitmap"""
+        node_id = self.index.get(term)
+        return (node_id is not None and node_id >> 3 < len(bitmap)
+                and (bitmap[node_id >> 3] >> (7 - (node_id & 7))) & 1)
+
+    def view(self, **filters):
+        """Graph over the intersection of the given filters, e.g. view(layer=4, cloud_provider="aws")"""
+        if not filters:
+            raise ValueError("A view needs at least one filter")
+        for key, value in filters.items():
+            self.bitmap(key, value)
+        store = ProjectedStore(self, tuple(filters.items()))
+        return Graph(store=store, namespace_manager=self.graph.namespace_manager)
+
+    def layer(self, number):
+        return self.view(layer=number)
+
+
+def main():
+    """Main view function"""
+    parser = argparse.ArgumentParser(description="Zero-copy layer and location subgraph views")
+    parser.add_argument("files", nargs="*", help="Turtle files to load (default: ontology and sample data)")
+    parser.add_argument("--layer", type=int, choices=sorted(LAYERS), help="Restrict the exported view to a layer")
+    for key in VIEW_PROPERTIES:
+        parser.add_argument(f"--{key.replace('_', '-')}", dest=key, help=f"Restrict the exported view by {key}")
+    parser.add_argument("--output", help="Serialize the selected view to this Turtle file")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("IT Infrastructure Ontology - Subgraph Views")
+    print("="*70)
+
+    graph = load_combined_graph(args.files or None)
+    catalog = ViewCatalog(graph)
+
+    print(f"\n{'='*70}")
+    print("LAYER VIEWS")
+    print(f"{'='*70}")
+    for number, layer in LAYERS.items():
+        start_time = time.time()
+        size = len(catalog.layer(number))
+        print(f"  Layer {number} {str(layer).split('#')[-1]:<30} {size:>6} triples "
+              f"({(time.time() - start_time)*1000:.1f} ms)")
+
+    # Same result as CELL 13 without rdfs:subClassOf*
+    query = """
+    PREFIX : <http://example.org/it-infrastructure-ontology#>
+    SELECT (COUNT(DISTINCT ?entity) AS ?count)
+    WHERE { ?entity a ?type ; :name ?name . }
+    """
+    count = int(list(catalog.layer(4).query(query))[0][0])
+    print(f"\n[OK] Layer 4 entities via SPARQL on the view: {count}")
+
+    filters = {key: getattr(args, key) for key in VIEW_PROPERTIES if getattr(args, key)}
+    if args.layer:
+        filters["layer"] = args.layer
+    if args.output:
+        if not filters:
+            print("[ERROR] --output needs at least one view filter")
+            sys.exit(1)
+        view = catalog.view(**filters)
+        view.serialize(destination=args.output, format='turtle')
+        print(f"[OK] View {filters} ({len(view)} triples) written to {args.output}")
+
+    sys.exit(0)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nInterrupted by user.")
+        sys.exit(130)
+    except Exception as e:
+        print(f"\n[ERROR] Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+All-Pairs Network Path Analysis for IT Infrastructure Ontology
+
+This script computes, for every pair of communicating applications, the
+CommunicationPath -> NetworkDevice -> connected_to hop sequence between them:
+- Hop count and the ordered list of traversed network devices
+- Firewalls and load balancers on the route (protected_by, device type)
+- Shared choke devices that appear on the routes of many pairs
+
+All sources are expanded together with a level-synchronous multi-source BFS
+over a sparse adjacency matrix instead of one query (3.6) per application.
+"""
+
+import argparse
+import sys
+from collections import Counter, defaultdict
+
+import numpy as np
+from scipy import sparse
+from rdflib import RDF
+
+from test_queries import ONTO, load_combined_graph
+
+# Edges of the undirected network topology
+TOPOLOGY_PROPERTIES = ["communicates_via", "routes_through", "connected_to"]
+
+# Relationships that make two endpoints a communicating pair
+COMMUNICATION_PROPERTIES = ["calls", "uses"]
+
+FIREWALL_TYPES = {ONTO.Firewall, ONTO.WAF}
+LOAD_BALANCER_TYPES = {ONTO.LoadBalancer}
+
+
+class NetworkTopology:
+    """Sparse adjacency matrix over endpoints, communication paths and devices"""
+
+    def __init__(self, graph):
+        self.nodes = []
+        self.index = {}
+        rows = []
+        cols = []
+
+        endpoints = set()
+        for prop in TOPOLOGY_PROPERTIES:
+            for s, o in graph.subject_objects(ONTO[prop]):
+                if prop == "communicates_via":
+                    endpoints.add(s)
+                a = self._add_node(s)
+                b = self._add_node(o)
+                rows.extend((a, b))
+                cols.extend((b, a))
+
+        n = len(self.nodes)
+        # int32 counts: with int8, 256 paths into one node would wrap to 0
+        # in a product and drop the node from the frontier
+        data = np.ones(len(rows), dtype=np.int32)
+        adjacency = sparse.csr_matrix((data, (rows, cols)), shape=(n, n))
+        adjacency.data[:] = 1
+        self.adjacency = adjacency
+
+        # Endpoints terminate routes: a path may start at the source
+        # endpoint but must never be relayed through another endpoint
+        self.is_endpoint = np.zeros(n, dtype=bool)
+        self.is_endpoint[[self.index[e] for e in endpoints]] = True
+        relay = sparse.diags((~self.is_endpoint).astype(np.int32), dtype=np.int32)
+        self.relay_adjacency = (relay @ adjacency).tocsr()
+
+        self.endpoints = endpoints
+
+    def _add_node(self, term):
+        node_id = self.index.get(term)
+        if node_id is None:
+            node_id = len(self.nodes)
+            self.index[term] = node_id
+            self.nodes.append(term)
+        return node_id
+
+
+def communicating_pairs(graph, topology):
+    """Return the (source, target) endpoint pairs that exchange traffic
+
+    A pair communicates when one calls or uses the other, or when both
+    communicate via the same CommunicationPath.
+    """
+    pairs = set()
+    for prop in COMMUNICATION_PROPERTIES:
+        for s, o in graph.subject_objects(ONTO[prop]):
+            if s != o and s in topology.endpoints and o in topology.endpoints:
+                pairs.add((s, o))
+
+    sharing = defaultdict(list)
+    for app, path in graph.subject_objects(ONTO.communicates_via):
+        sharing[path].append(app)
+    for apps in sharing.values():
+        apps = sorted(set(apps), key=str)
+        for i, a in enumerate(apps):
+            for b in apps[i + 1:]:
+                if (b, a) not in pairs:
+                    pairs.add((a, b))
+
+    return sorted(pairs, key=lambda pair: (str(pair[0]), str(pair[1])))
+
+
+def multi_source_bfs(topology, sources, max_hops=32):
+    """Breadth-first search from all sources at once
+
+    Returns the list of per-level frontier matrices (sources x nodes);
+    level d holds a 1 at (i, v) when v is exactly d edges from sources[i].
+    """
+    k = len(sources)
+    n = len(topology.nodes)
+    seeds = [topology.index[s] for s in sources]
+    frontier = sparse.csr_matrix(
+        (np.ones(k, dtype=np.int32), (np.arange(k), seeds)), shape=(k, n)
+    )
+    visited = frontier.copy()
+    levels = [frontier]
+
+    for depth in range(max_hops):
+        adjacency = topology.adjacency if depth == 0 else topology.relay_adjacency
+        reached = (frontier @ adjacency).tocsr()
+        reached.data[:] = 1
+        frontier = (reached - reached.multiply(visited)).tocsr()
+        frontier.eliminate_zeros()
+        if frontier.nnz == 0:
+            break
+        visited = visited + frontier
+        levels.append(frontier)
+
+    return levels
+
+
+def reconstruct_route(topology, levels, row, target):
+    """Walk the BFS levels backwards from target to the source of row"""
+    depth = None
+    for d in range(len(levels) - 1, -1, -1):
+        if levels[d][row, target]:
+            depth = d
+            break
+    if depth is None:
+        return None
+
+    adjacency = topology.adjacency
+    route = [target]
+    node = target
+    for d in range(depth - 1, -1, -1):
+        level_row = levels[d].getrow(row)
+        candidates = set(level_row.indices)
+        neighbours = adjacency.indices[adjacency.indptr[node]:adjacency.indptr[node + 1]]
+        node = next(int(u) for u in neighbours
+                    if u in candidates and (d == 0 or not topology.is_endpoint[u]))
+        route.append(node)
+    route.reverse()
+    return route
+
+
+def analyze_network_paths(graph, max_hops=32):
+    """Compute the network route and its security/balancing hops for every pair
+
+    Returns one dict per communicating pair; pairs without any network
+    route are reported with route None.
+    """
+    topology = NetworkTopology(graph)
+    pairs = communicating_pairs(graph, topology)
+
+    sources = sorted({s for s, _ in pairs}, key=str)
+    row_of = {s: i for i, s in enumerate(sources)}
+    levels = multi_source_bfs(topology, sources, max_hops) if sources else []
+
+    type_cache = {}
+
+    def types(node):
+        if node not in type_cache:
+            type_cache[node] = set(graph.objects(node, RDF.type))
+        return type_cache[node]
+
+    def device_type(node):
+        return str(graph.value(node, ONTO.device_type) or "")
+
+    def is_firewall(node):
+        return bool(types(node) & FIREWALL_TYPES) or device_type(node) == "firewall"
+
+    def is_load_balancer(node):
+        return bool(types(node) & LOAD_BALANCER_TYPES) or device_type(node) == "load_balancer"
+
+    rows = []
+    for source, target in pairs:
+        route_ids = reconstruct_route(topology, levels, row_of[source], topology.index[target])
+        if route_ids is None:
+            rows.append({"source": source, "target": target, "route": None,
+                         "hops": None, "devices": [], "firewalls": [], "load_balancers": []})
+            continue
+
+        route = [topology.nodes[i] for i in route_ids]
+        interior = route[1:-1]
+        devices = [node for node in interior if ONTO.CommunicationPath not in types(node)]
+
+        firewalls = [node for node in devices if is_firewall(node)]
+        for node in [source, target] + devices:
+            for guard in graph.objects(node, ONTO.protected_by):
+                if guard not in firewalls and is_firewall(guard):
+                    firewalls.append(guard)
+
+        rows.append({
+            "source": source,
+            "target": target,
+            "route": route,
+            "hops": len(route) - 1,
+            "devices": devices,
+            "firewalls": firewalls,
+            "load_balancers": [node for node in devices if is_load_balancer(node)],
+        })
+
+    return rows
+
+
+def choke_devices(rows):
+    """Rank network devices by the number of pair routes that traverse them"""
+    counts = Counter()
+    for row in rows:
+        counts.update(set(row["devices"]))
+    return [(device, count) for device, count in counts.most_common() if count > 1]
+
+
+def short_name(graph, term):
+    """Display name for an entity"""
+    return str(graph.value(term, ONTO.name) or str(term).split('#')[-1])
+
+
+def main():
+    """Main analysis function"""
+    parser = argparse.ArgumentParser(description="All-pairs network path analysis")
+    parser.add_argument("files", nargs="*", help="Turtle files to load (default: ontology and sample data)")
+    parser.add_argument("--max-hops", type=int, default=32, help="Maximum route length to search")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("IT Infrastructure Ontology - Network Path Analysis")
+    print("="*70)
+
+    graph = load_combined_graph(args.files or None)
+    rows = analyze_network_paths(graph, args.max_hops)
+
+    print(f"\n{'='*70}")
+    print(f"COMMUNICATING PAIRS ({len(rows)})")
+    print(f"{'='*70}")
+    for row in rows:
+        pair = f"{short_name(graph, row['source'])} -> {short_name(graph, row['target'])}"
+        if row["route"] is None:
+            print(f"\n  {pair}: [WARN] no network route")
+            continue
+        print(f"\n  {pair}: {row['hops']} hop(s)")
+        print(f"    Route: {' -> '.join(short_name(graph, n) for n in row['route'])}")
+        if row["firewalls"]:
+            print(f"    Firewalls: {', '.join(short_name(graph, n) for n in row['firewalls'])}")
+        if row["load_balancers"]:
+            print(f"    Load balancers: {', '.join(short_name(graph, n) for n in row['load_balancers'])}")
+
+    print(f"\n{'='*70}")
+    print("SHARED CHOKE DEVICES")
+    print(f"{'='*70}")
+    chokes = choke_devices(rows)
+    if not chokes:
+        print("[OK] No network device is shared by more than one route")
+    for device, count in chokes:
+        print(f"  {short_name(graph, device):<40} {count} route(s)")
+
+    sys.exit(0)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nAnalysis interrupted by user.")
+        sys.exit(130)
+    except Exception as e:
+        print(f"\n[ERROR] Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Property Graph Export for IT Infrastructure Ontology
+
+This script converts the RDF inventory into the bulk-import CSV layout
+used by Cypher graph databases (neo4j-admin database import):
+- Ontology classes become node labels, data properties node properties
+- Object properties become relationship types (runs_on -> RUNS_ON),
+  matching the Cypher patterns in query-patterns.md
+- Triples are streamed into hash partitions on disk and each partition
+  is written by its own worker process. A writer sorts its partition
+  externally by subject (sorted runs of chunk_records records, merged)
+  and writes one entity at a time, so its memory is bounded by the run
+  size, not by the partition or the whole inventory
+
+Only N-Triples input is streamed, one statement at a time. Turtle input
+is parsed into an RDFLib graph per file first, so its memory grows with
+the largest Turtle file; convert large inventories to N-Triples before
+exporting them. validate_export() checks the files the way the bulk
+importer would, so no database is needed to test an export.
+"""
+
+import argparse
+import csv
+import heapq
+import json
+import sys
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+
+from rdflib import BNode, Graph, Literal, OWL, RDF, RDFS
+from rdflib.plugins.parsers.ntriples import W3CNTriplesParser
+
+from test_queries import DEFAULT_FILES
+
+# Vocabularies whose terms are schema or annotations, not inventory
+SCHEMA_NAMESPACES = (
+    str(RDF), str(RDFS), str(OWL),
+    "http://www.w3.org/ns/shacl#",
+    "http://www.w3.org/2004/02/skos/core#",
+    "http://purl.org/dc/terms/",
+)
+
+NUMERIC_TYPES = {
+    "http://www.w3.org/2001/XMLSchema#integer": "long",
+    "http://www.w3.org/2001/XMLSchema#int": "int",
+    "http://www.w3.org/2001/XMLSchema#long": "long",
+    "http://www.w3.org/2001/XMLSchema#decimal": "double",
+    "http://www.w3.org/2001/XMLSchema#double": "double",
+    "http://www.w3.org/2001/XMLSchema#float": "float",
+    "http://www.w3.org/2001/XMLSchema#boolean": "boolean",
+}
+
+ARRAY_DELIMITER = ";"
+
+# Spool records a partition writer sorts in memory at a time
+CHUNK_RECORDS = 100_000
+
+
+def local_name(iri):
+    """Fragment or last path segment of an IRI"""
+    return iri.rsplit('#', 1)[-1].rsplit('/', 1)[-1]
+
+
+def relationship_type(iri):
+    """Cypher relationship type for an object property"""
+    return local_name(iri).upper()
+
+
+def _is_schema(iri):
+    return iri.startswith(SCHEMA_NAMESPACES)
+
+
+def _partition_of(iri, partitions):
+    return zlib.crc32(iri.encode("utf-8")) % partitions
+
+
+class PropertyGraphExporter:
+    """Streams triples into per-partition spool files, then writes CSVs in parallel"""
+
+    def __init__(self, out_dir, partitions=4, workers=None, chunk_records=CHUNK_RECORDS):
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.partitions = partitions
+        self.workers = workers or partitions
+        self.chunk_records = chunk_records
+        self._spool_dir = tempfile.TemporaryDirectory(prefix="pg-export-")
+        self._spools = [open(Path(self._spool_dir.name) / f"part-{i}.jsonl", "w", encoding="utf-8")
+                        for i in range(partitions)]
+        self.property_types = {}
+        self.triples = 0
+
+    def _spool(self, key, record):
+        self._spools[_partition_of(key, self.partitions)].write(json.dumps(record) + "\n")
+
+    def triple(self, s, p, o):
+        """Accept one triple (also the sink interface of the N-Triples parser)"""
+        self.triples += 1
+        if isinstance(s, BNode) or isinstance(o, BNode):
+            return
+        s, p = str(s), str(p)
+        if p == str(RDF.type):
+            if not _is_schema(str(o)):
+                self._spool(s, ["label", s, local_name(str(o))])
+            else:
+                self._spool(s, ["schema", s])
+            return
+        if _is_schema(p):
+            return
+        if isinstance(o, Literal):
+            key = local_name(p)
+            datatype = str(o.datatype) if o.datatype else None
+            seen = self.property_types.setdefault(key, datatype)
+            if seen != datatype:
+                self.property_types[key] = None
+            self._spool(s, ["property", s, key, str(o)])
+        else:
+            o = str(o)
+            self._spool(s, ["relationship", s, relationship_type(p), o])
+            self._spool(o, ["mention", o])
+
+    def add_graph(self, graph):
+        """Stream every triple of an already parsed graph"""
+        for s, p, o in graph:
+            self.triple(s, p, o)
+
+    def add_ntriples(self, path):
+        """Stream an N-Triples file statement by statement"""
+        with open(path, "rb") as source:
+            W3CNTriplesParser(sink=self).parse(source)
+
+    def _columns(self):
+        columns = []
+        for key in sorted(self.property_types):
+            datatype = NUMERIC_TYPES.get(self.property_types[key])
+            columns.append((key, datatype))
+        return columns
+
+    def finish(self):
+        """Write headers and partition CSVs; returns export statistics"""
+        for spool in self._spools:
+            spool.close()
+        columns = self._columns()
+
+        jobs = [(str(Path(self._spool_dir.name) / f"part-{i}.jsonl"), str(self.out_dir), i,
+                 [key for key, _ in columns], self.chunk_records) for i in range(self.partitions)]
+        if self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(_write_partition, jobs))
+        else:
+            results = [_write_partition(job) for job in jobs]
+
+        # Headers are written last: a property becomes an array only if
+        # some partition saw it with more than one value
+        multi_valued = set().union(*(r[2] for r in results))
+        with open(self.out_dir / "nodes_header.csv", "w", newline="", encoding="utf-8") as f:
+            header = ["id:ID", ":LABEL"]
+            for key, datatype in columns:
+                suffix = "[]" if key in multi_valued else ""
+                header.append(f"{key}:{datatype or 'string'}{suffix}")
+            csv.writer(f).writerow(header)
+        with open(self.out_dir / "relationships_header.csv", "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow([":START_ID", ":END_ID", ":TYPE"])
+        self._spool_dir.cleanup()
+
+        return {
+            "triples": self.triples,
+            "nodes": sum(r[0] for r in results),
+            "relationships": sum(r[1] for r in results),
+            "partitions": self.partitions,
+        }
+
+
+def _sorted_runs(spool_path, chunk_records, run_dir):
+    """Split a spool into files of chunk_records records, each sorted by subject
+
+    The sort is stable, so records of one subject keep their spool order.
+    """
+    runs = []
+    with open(spool_path, encoding="utf-8") as spool:
+        while True:
+            chunk = [json.loads(line) for _, line in zip(range(chunk_records), spool)]
+            if not chunk:
+                break
+            chunk.sort(key=itemgetter(1))
+            run_path = Path(run_dir) / f"run-{len(runs)}.jsonl"
+            with open(run_path, "w", encoding="utf-8") as run:
+                for record in chunk:
+                    run.write(json.dumps(record) + "\n")
+            runs.append(run_path)
+    return runs
+
+
+def _read_run(run_path):
+    with open(run_path, encoding="utf-8") as run:
+        for line in run:
+            yield json.loads(line)
+
+
+def _write_partition(job):
+    """Sort one spool partition by subject externally and write its node/relationship CSVs"""
+    spool_path, out_dir, part, columns, chunk_records = job
+    nodes = 0
+    relationships = 0
+    multi_valued = set()
+    out_dir = Path(out_dir)
+    with tempfile.TemporaryDirectory(prefix=f"pg-runs-{part}-") as run_dir, \
+            open(out_dir / f"nodes_part_{part}.csv", "w", newline="", encoding="utf-8") as nf, \
+            open(out_dir / f"relationships_part_{part}.csv", "w", newline="", encoding="utf-8") as rf:
+        node_writer = csv.writer(nf)
+        rel_writer = csv.writer(rf)
+        # heapq.merge prefers earlier runs on ties, so spool order is kept
+        records = heapq.merge(*(_read_run(run) for run in _sorted_runs(spool_path, chunk_records, run_dir)),
+                              key=itemgetter(1))
+        for iri, group in groupby(records, key=itemgetter(1)):
+            labels = set()
+            props = {}
+            rels = []
+            schema = False
+            for record in group:
+                kind = record[0]
+                if kind == "label":
+                    labels.add(record[2])
+                elif kind == "schema":
+                    schema = True
+                elif kind == "property":
+                    props.setdefault(record[2], []).append(record[3])
+                elif kind == "relationship":
+                    rels.append((record[2], record[3]))
+            if schema and not labels:
+                continue
+            row = [iri, ARRAY_DELIMITER.join(sorted(labels) or ["Resource"])]
+            for key in columns:
+                values = props.get(key, [])
+                if len(values) > 1:
+                    multi_valued.add(key)
+                row.append(ARRAY_DELIMITER.join(values))
+            node_writer.writerow(row)
+            nodes += 1
+            for rel_type, target in rels:
+                rel_writer.writerow([iri, target, rel_type])
+                relationships += 1
+    return nodes, relationships, multi_valued
+
+
+def validate_export(out_dir):
+    """Check an export the way the bulk importer would, without a database
+
+    Returns a list of problems: duplicate node ids and relationships whose
+    endpoints are missing.
+    """
+    out_dir = Path(out_dir)
+    problems = []
+    ids = set()
+    for path in sorted(out_dir.glob("nodes_part_*.csv")):
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.reader(f):
+                if row[0] in ids:
+                    problems.append(f"duplicate node id {row[0]} in {path.name}")
+                ids.add(row[0])
+    for path in sorted(out_dir.glob("relationships_part_*.csv")):
+        with open(path, newline="", encoding="utf-8") as f:
+            for start, end, rel_type in csv.reader(f):
+                for endpoint in (start, end):
+                    if endpoint not in ids:
+                        problems.append(f"{rel_type} endpoint {endpoint} has no node ({path.name})")
+    return problems
+
+
+def import_command(out_dir, partitions):
+    """neo4j-admin invocation for an export"""
+    nodes = ",".join(["nodes_header.csv"] + [f"nodes_part_{i}.csv" for i in range(partitions)])
+    rels = ",".join(["relationships_header.csv"] + [f"relationships_part_{i}.csv" for i in range(partitions)])
+    return (f"cd {out_dir} && neo4j-admin database import full "
+            f"--nodes={nodes} --relationships={rels} --array-delimiter=\"{ARRAY_DELIMITER}\"")
+
+
+def main():
+    """Main export function"""
+    parser = argparse.ArgumentParser(description="Export the RDF inventory as property graph CSVs")
+    parser.add_argument("files", nargs="*",
+                        help="N-Triples (.nt, streamed) or Turtle files (parsed in memory; "
+                             "default: ontology and sample data)")
+    parser.add_argument("--out", default="property-graph-export", help="Output directory")
+    parser.add_argument("--partitions", type=int, default=4, help="Number of partition files/writers")
+    parser.add_argument("--chunk-records", type=int, default=CHUNK_RECORDS,
+                        help="Records each writer sorts in memory at a time")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("IT Infrastructure Ontology - Property Graph Export")
+    print("="*70)
+
+    files = args.files or [Path(__file__).parent / name for name in DEFAULT_FILES]
+    start_time = time.time()
+    exporter = PropertyGraphExporter(args.out, args.partitions, chunk_records=args.chunk_records)
+    for file_path in map(Path, files):
+        if not file_path.exists():
+            print(f"  [ERROR] File not found: {file_path.name}")
+            continue
+        if file_path.suffix == ".nt":
+            exporter.add_ntriples(file_path)
+            print(f"  [OK] Streamed {file_path.name}")
+        else:
+            # Not streamed: the whole file is parsed into memory first
+            graph = Graph()
+            graph.parse(file_path, format='turtle')
+            exporter.add_graph(graph)
+            print(f"  [OK] Parsed and exported {file_path.name}")
+    stats = exporter.finish()
+    elapsed = time.time() - start_time
+
+    print(f"\n[OK] Exported {stats['nodes']} nodes and {stats['relationships']} relationships "
+          f"from {stats['triples']} triples in {elapsed:.3f} seconds ({stats['partitions']} partitions)")
+
+    problems = validate_export(args.out)
+    if problems:
+        print(f"\n[WARN] {len(problems)} import problem(s):")
+        for problem in problems[:10]:
+            print(f"  {problem}")
+    else:
+        print("[OK] Export validated: unique node ids, all relationship endpoints present")
+
+    print(f"\nImport with:\n  {import_command(args.out, stats['partitions'])}")
+    sys.exit(0 if not problems else 1)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nExport interrupted by user.")
+        sys.exit(130)
+    except Exception as e:
+        print(f"\n[ERROR] Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Batch Root Cause Analysis for IT Infrastructure Ontology
+
+This script explains many alerting entities at once. Instead of running
+the test_root_cause_queries() traversal per alerting application it:
+- Walks the dependency graph once, memoizing for every node the set of
+  failed or degraded components (by lifecycle_status) below it
+- Collapses dependency cycles (e.g. connected_to) into strongly
+  connected components so each is visited a single time
+- Returns the smallest set of failed components that explains all
+  symptoms, ranked by the number of symptoms each one explains
+"""
+
+import argparse
+import sys
+import time
+
+from rdflib import RDF, Literal
+
+from dependency_analysis import DEPENDENCY_PROPERTIES, DependencyGraph
+from test_queries import INST, ONTO, load_combined_graph
+
+# A failure propagates up calls and composition edges as well as hosting ones
+ROOT_CAUSE_PROPERTIES = DEPENDENCY_PROPERTIES + ["calls", "contains", "deployed_on"]
+
+# Statuses treated as a fault, as in test_root_cause_queries()
+FAILURE_STATUSES = {"failed", "degraded", "stopped", "terminated", "inactive"}
+
+
+def strongly_connected_components(dep):
+    """Iterative Tarjan SCC; returns a component id per node"""
+    n = len(dep.nodes)
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    component = [-1] * n
+    stack = []
+    counter = 0
+    components = 0
+
+    for start in range(n):
+        if index[start] != -1:
+            continue
+        work = [(start, iter(dep.successors[start]))]
+        index[start] = low[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack[start] = True
+        while work:
+            v, children = work[-1]
+            advanced = False
+            for w in children:
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, iter(dep.successors[w])))
+                    advanced = True
+                    break
+                if on_stack[w]:
+                    low[v] = min(low[v], index[w])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[v])
+            if low[v] == index[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component[w] = components
+                    if w == v:
+                        break
+                components += 1
+
+    return component, components
+
+
+class RootCauseAnalyzer:
+    """Shared, memoized failure-reachability over the dependency graph"""
+
+    def __init__(self, graph, dep=None):
+        self.graph = graph
+        self.dep = dep or DependencyGraph.from_graph(graph, ROOT_CAUSE_PROPERTIES)
+        self.component, count = strongly_connected_components(self.dep)
+
+        self.members = [[] for _ in range(count)]
+        for node_id, comp in enumerate(self.component):
+            self.members[comp].append(node_id)
+        self.component_successors = [set() for _ in range(count)]
+        for s, t in self.dep._edges:
+            cs, ct = self.component[s], self.component[t]
+            if cs != ct:
+                self.component_successors[cs].add(ct)
+
+        self.refresh_status()
+
+    def refresh_status(self):
+        """Re-read lifecycle_status and drop memoized results"""
+        self.failed = []
+        self.failed_bit = {}
+        for node_id, term in enumerate(self.dep.nodes):
+            status = self.graph.value(term, ONTO.lifecycle_status)
+            if status is not None and str(status).lower() in FAILURE_STATUSES:
+                self.failed_bit[node_id] = 1 << len(self.failed)
+                self.failed.append(node_id)
+        self._memo = {}
+
+    def _closure(self, comp):
+        """Bitmask of failed nodes reachable from a component (memoized)"""
+        memo = self._memo
+        if comp in memo:
+            return memo[comp]
+
+        work = [(comp, iter(self.component_successors[comp]))]
+        pending = {comp}
+        while work:
+            c, children = work[-1]
+            advanced = False
+            for d in children:
+                if d not in memo and d not in pending:
+                    pending.add(d)
+                    work.append((d, iter(self.component_successors[d])))
+                    advanced = True
+                    break
+            if advanced:
+                continue
+            work.pop()
+            mask = 0
+            for node_id in self.members[c]:
+                mask |= self.failed_bit.get(node_id, 0)
+            for d in self.component_successors[c]:
+                mask |= memo[d]
+            memo[c] = mask
+        return memo[comp]
+
+    def analyze(self, symptoms):
+        """Explain a batch of symptomatic entities
+
+        Returns (causes, unexplained): causes is a ranked list of
+        (component, [symptoms explained]) chosen greedily so that the
+        fewest failed components cover every explainable symptom.
+        """
+        explains = {}
+        unexplained = []
+        for symptom in symptoms:
+            node_id = self.dep.index.get(symptom)
+            mask = self._closure(self.component[node_id]) if node_id is not None else 0
+            if not mask:
+                unexplained.append(symptom)
+                continue
+            bit = 0
+            while mask:
+                if mask & 1:
+                    explains.setdefault(bit, set()).add(symptom)
+                mask >>= 1
+                bit += 1
+
+        # Greedy set cover; ties go to the component with the fewest failed
+        # dependencies of its own, i.e. the one closest to the root cause
+        remaining = set().union(*explains.values()) if explains else set()
+        causes = []
+        while remaining:
+            bit = max(explains, key=lambda b: (
+                len(explains[b] & remaining),
+                -bin(self._closure(self.component[self.failed[b]])).count("1"),
+                -b,
+            ))
+            covered = explains[bit] & remaining
+            if not covered:
+                break
+            causes.append((self.dep.nodes[self.failed[bit]], sorted(covered, key=str)))
+            remaining -= covered
+            del explains[bit]
+
+        return causes, unexplained
+
+
+def resolve(graph, label):
+    """Find an entity by instance local name or :name value"""
+    if label.isidentifier() and (INST[label], None, None) in graph:
+        return INST[label]
+    for term in graph.subjects(ONTO.name, None):
+        if str(graph.value(term, ONTO.name)) == label:
+            return term
+    return None
+
+
+def main():
+    """Main root cause analysis function"""
+    parser = argparse.ArgumentParser(description="Batch root cause analysis")
+    parser.add_argument("files", nargs="*", help="Turtle files to load (default: ontology and sample data)")
+    parser.add_argument("--symptom", action="append", default=[],
+                        help="Alerting entity (local name or :name); default: all applications")
+    parser.add_argument("--simulate-failure", action="append", default=[],
+                        help="Mark an entity as failed before the analysis")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("IT Infrastructure Ontology - Batch Root Cause Analysis")
+    print("="*70)
+
+    graph = load_combined_graph(args.files or None)
+
+    for label in args.simulate_failure:
+        term = resolve(graph, label)
+        if term is None:
+            print(f"  [WARN] Unknown entity: {label}")
+            continue
+        graph.set((term, ONTO.lifecycle_status, Literal("failed")))
+
+    if args.symptom:
+        symptoms = [t for t in (resolve(graph, label) for label in args.symptom) if t is not None]
+    else:
+        symptoms = sorted(set(graph.subjects(RDF.type, ONTO.Application)), key=str)
+
+    start_time = time.time()
+    analyzer = RootCauseAnalyzer(graph)
+    build_time = time.time() - start_time
+
+    start_time = time.time()
+    causes, unexplained = analyzer.analyze(symptoms)
+    analysis_time = time.time() - start_time
+
+    print(f"\n[OK] Dependency graph indexed in {build_time*1000:.1f} ms "
+          f"({len(analyzer.dep.nodes)} nodes, {len(analyzer.failed)} failed/degraded)")
+    print(f"[OK] {len(symptoms)} symptom(s) analyzed in {analysis_time*1000:.1f} ms")
+
+    print(f"\n{'='*70}")
+    print("PROBABLE ROOT CAUSES (ranked)")
+    print(f"{'='*70}")
+    if not causes:
+        print("  No failed or degraded component explains the symptoms")
+    for rank, (component, explained) in enumerate(causes, 1):
+        name = graph.value(component, ONTO.name) or component
+        status = graph.value(component, ONTO.lifecycle_status)
+        print(f"\n  {rank}. {name} [{status}] explains {len(explained)} symptom(s)")
+        for symptom in explained:
+            print(f"     - {graph.value(symptom, ONTO.name) or symptom}")
+
+    if unexplained:
+        print(f"\n  Unexplained symptoms: {len(unexplained)}")
+
+    sys.exit(0)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nAnalysis interrupted by user.")
+        sys.exit(130)
+    except Exception as e:
+        print(f"\n[ERROR] Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Sharded Query Execution for IT Infrastructure Ontology
+
+This script partitions the instance data into shards by cloud_provider,
+region or location and runs the traversal queries of test_queries.py as
+scatter-gather over local worker processes:
+- Root cause: applications down to failed or degraded components
+- Impact: physical servers up to the applications they carry
+- Decomposition: business processes down to physical infrastructure
+
+Every shard holds a replica of the ontology, the triples of the entities
+it owns and a copy of each dependency edge that crosses into it (boundary
+edges), so it can follow edges in either direction. A traversal that
+leaves a shard is continued by the shard owning the next entity; the
+coordinator routes these continuations between rounds and reports how
+many crossed shards. Entities without placement attributes (applications,
+pods, business processes) are placed with the nearest placed dependency.
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+from collections import defaultdict, deque
+from multiprocessing import Pipe, Process
+
+from rdflib import RDF, Graph, Literal, URIRef
+
+from dependency_analysis import DependencyGraph
+from reasoner import superclass_closure
+from root_cause import FAILURE_STATUSES, ROOT_CAUSE_PROPERTIES, resolve
+from test_queries import INST, ONTO, load_combined_graph, site_of
+
+# Placement attributes in order of precedence
+SHARD_KEYS = ("cloud_provider", "region", "location")
+
+# name: (start class, direction, match)
+QUERIES = {
+    "root-cause": (ONTO.Application, "down", ("status", frozenset(FAILURE_STATUSES))),
+    "impact": (ONTO.PhysicalServer, "up", ("class", ONTO.Application)),
+    "decomposition": (ONTO.BusinessProcess, "down", ("class", ONTO.PhysicalInfrastructureLayer)),
+}
+
+
+def shard_key(graph, term, keys=SHARD_KEYS):
+    """Placement of an entity from its own attributes, or None"""
+    for key in keys:
+        value = graph.value(term, ONTO[key])
+        if value is not None:
+            return site_of(value) if key == "location" else str(value)
+    return None
+
+
+def partition(graph, keys=SHARD_KEYS, workers=None):
+    """Assign every instance to a shard; returns (owner, shard_sites)
+
+    Sites are packed onto at most `workers` shards, largest first onto
+    the least loaded shard.
+    """
+    instances = sorted({s for s in graph.subjects() if str(s).startswith(str(INST))}, key=str)
+    site = {term: shard_key(graph, term, keys) for term in instances}
+
+    # Unplaced entities inherit the site of the nearest placed dependency
+    dep = DependencyGraph.from_graph(graph, ROOT_CAUSE_PROPERTIES)
+    queue = deque(dep.index[t] for t in instances if site[t] is not None and t in dep.index)
+    while queue:
+        v = queue.popleft()
+        for u in dep.predecessors[v]:
+            term = dep.nodes[u]
+            if site.get(term, "") is None:
+                site[term] = site[dep.nodes[v]]
+                queue.append(u)
+    for term in instances:
+        if site[term] is None:
+            site[term] = "unplaced"
+
+    sizes = defaultdict(int)
+    for value in site.values():
+        sizes[value] += 1
+    count = min(len(sizes), workers or os.cpu_count() or 1)
+    shard_sites = [[] for _ in range(count)]
+    load = [0] * count
+    shard_of_site = {}
+    for value in sorted(sizes, key=lambda v: (-sizes[v], v)):
+        shard = load.index(min(load))
+        shard_sites[shard].append(value)
+        load[shard] += sizes[value]
+        shard_of_site[value] = shard
+
+    owner = {term: shard_of_site[value] for term, value in site.items()}
+    return owner, shard_sites
+
+
+def build_shards(graph, owner, count):
+    """Split the graph into per-shard graphs with replicated ontology and boundary edges"""
+    properties = {ONTO[p] for p in ROOT_CAUSE_PROPERTIES}
+    shards = [Graph() for _ in range(count)]
+    boundary_edges = 0
+    for s, p, o in graph:
+        shard = owner.get(s)
+        if shard is None:
+            for shard_graph in shards:
+                shard_graph.add((s, p, o))
+            continue
+        shards[shard].add((s, p, o))
+        target = owner.get(o)
+        if p in properties and target is not None and target != shard:
+            shards[target].add((s, p, o))
+            boundary_edges += 1
+    return shards, boundary_edges
+
+
+class Shard:
+    """Traversal state over one shard graph"""
+
+    def __init__(self, graph, owned=None):
+        self.graph = graph
+        self.owned = owned
+        self.dep = DependencyGraph.from_graph(graph, ROOT_CAUSE_PROPERTIES)
+        self.superclasses = superclass_closure(graph)
+        self._seen = {}
+
+    def begin(self):
+        """Forget the visited set of the previous query"""
+        self._seen = {}
+
+    def _matches(self, term, match):
+        kind, value = match
+        if kind == "status":
+            status = self.graph.value(term, ONTO.lifecycle_status)
+            return status is not None and str(status).lower() in value
+        for cls in self.graph.objects(term, RDF.type):
+            if cls == value or value in self.superclasses.get(cls, ()):
+                return True
+        return False
+
+    def expand(self, direction, frontier, match):
+        """Traverse from the frontier as far as this shard owns the entities
+
+        frontier maps entity IRIs to bitmasks of the start entities that
+        reach them. Returns (matched, remote): matching owned entities
+        and the entities owned elsewhere where the traversal must
+        continue, both with the start bits that reached them.
+        """
+        adjacency = self.dep.successors if direction == "down" else self.dep.predecessors
+        matched = defaultdict(int)
+        remote = defaultdict(int)
+        agenda = [(URIRef(iri), mask) for iri, mask in frontier.items()]
+        while agenda:
+            term, mask = agenda.pop()
+            new = mask & ~self._seen.get(term, 0)
+            if not new:
+                continue
+            self._seen[term] = self._seen.get(term, 0) | new
+            if self.owned is not None and term not in self.owned:
+                remote[str(term)] |= new
+                continue
+            if self._matches(term, match):
+                matched[str(term)] |= new
+            node_id = self.dep.index.get(term)
+            if node_id is not None:
+                for next_id in adjacency[node_id]:
+                    agenda.append((self.dep.nodes[next_id], new))
+        return dict(matched), dict(remote)
+
+
+def _serve(conn, data, owned):
+    """Worker process: load one shard and answer begin/expand requests"""
+    graph = Graph()
+    graph.parse(data=data, format='nt')
+    shard = Shard(graph, {URIRef(iri) for iri in owned})
+    conn.send_bytes(pickle.dumps(len(graph)))
+    while True:
+        command, *args = pickle.loads(conn.recv_bytes())
+        if command == "close":
+            break
+        if command == "begin":
+            shard.begin()
+            continue
+        conn.send_bytes(pickle.dumps(shard.expand(*args)))
+    conn.close()
+
+
+def _masks_to_results(starts, matched):
+    results = {start: set() for start in starts}
+    for iri, mask in matched.items():
+        for bit, start in enumerate(starts):
+            if mask >> bit & 1:
+                results[start].add(URIRef(iri))
+    return results
+
+
+class ShardedExecutor:
+    """Coordinator scattering traversal rounds over shard worker processes"""
+
+    def __init__(self, graph, keys=SHARD_KEYS, workers=None):
+        self.owner, self.shard_sites = partition(graph, keys, workers)
+        shard_graphs, self.boundary_edges = build_shards(graph, self.owner, len(self.shard_sites))
+        self.shard_sizes = [len(g) for g in shard_graphs]
+
+        self._connections = []
+        self._processes = []
+        for shard, shard_graph in enumerate(shard_graphs):
+            owned = [str(t) for t, s in self.owner.items() if s == shard]
+            parent, child = Pipe()
+            process = Process(target=_serve, args=(child, shard_graph.serialize(format='nt'), owned),
+                              daemon=True)
+            process.start()
+            self._connections.append(parent)
+            self._processes.append(process)
+        for conn in self._connections:
+            pickle.loads(conn.recv_bytes())
+
+    def _send(self, shard, message):
+        payload = pickle.dumps(message)
+        self._connections[shard].send_bytes(payload)
+        return len(payload)
+
+    def run(self, direction, starts, match):
+        """Run one traversal for many start entities; returns (results, traffic)"""
+        traffic = {"rounds": 0, "continuations": 0, "bytes": 0}
+        for shard in range(len(self._connections)):
+            self._send(shard, ("begin",))
+
+        frontier = defaultdict(dict)
+        forwarded = {}
+        for bit, start in enumerate(starts):
+            shard = self.owner.get(start)
+            if shard is not None:
+                frontier[shard][str(start)] = frontier[shard].get(str(start), 0) | 1 << bit
+                forwarded[str(start)] = forwarded.get(str(start), 0) | 1 << bit
+
+        matched = defaultdict(int)
+        while frontier:
+            traffic["rounds"] += 1
+            # Scatter to every shard with work, then gather all replies
+            for shard, entries in frontier.items():
+                traffic["bytes"] += self._send(shard, ("expand", direction, entries, match))
+            replies = []
+            for shard in frontier:
+                payload = self._connections[shard].recv_bytes()
+                traffic["bytes"] += len(payload)
+                replies.append(pickle.loads(payload))
+
+            frontier = defaultdict(dict)
+            for shard_matched, remote in replies:
+                for iri, mask in shard_matched.items():
+                    matched[iri] |= mask
+                for iri, mask in remote.items():
+                    target = self.owner.get(URIRef(iri))
+                    new = mask & ~forwarded.get(iri, 0)
+                    if target is None or not new:
+                        continue
+                    forwarded[iri] = forwarded.get(iri, 0) | new
+                    frontier[target][iri] = frontier[target].get(iri, 0) | new
+                    traffic["continuations"] += 1
+
+        return _masks_to_results(starts, matched), traffic
+
+    def close(self):
+        for shard in range(len(self._connections)):
+            self._send(shard, ("close",))
+        for process in self._processes:
+            process.join()
+
+
+def run_single(shard, direction, starts, match):
+    """Reference execution of the same traversal on the unpartitioned graph"""
+    shard.begin()
+    frontier = {}
+    for bit, start in enumerate(starts):
+        frontier[str(start)] = frontier.get(str(start), 0) | 1 << bit
+    matched, _ = shard.expand(direction, frontier, match)
+    return _masks_to_results(starts, matched)
+
+
+def main():
+    """Main sharded execution function"""
+    parser = argparse.ArgumentParser(description="Scatter-gather query execution over shards")
+    parser.add_argument("files", nargs="*", help="Turtle files to load (default: ontology and sample data)")
+    parser.add_argument("--shard-by", default=",".join(SHARD_KEYS),
+                        help="Comma-separated placement attributes in order of precedence")
+    parser.add_argument("--workers", type=int, help="Maximum number of shard worker processes")
+    parser.add_argument("--simulate-failure", action="append", default=[],
+                        help="Mark an entity as failed before the analysis")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("IT Infrastructure Ontology - Sharded Query Execution")
+    print("="*70)
+
+    graph = load_combined_graph(args.files or None)
+    for label in args.simulate_failure:
+        term = resolve(graph, label)
+        if term is None:
+            print(f"  [WARN] Unknown entity: {label}")
+            continue
+        graph.set((term, ONTO.lifecycle_status, Literal("failed")))
+
+    keys = tuple(key.strip() for key in args.shard_by.split(",") if key.strip())
+    start_time = time.time()
+    executor = ShardedExecutor(graph, keys, args.workers)
+    print(f"\n[OK] {len(executor.shard_sites)} shard worker(s) started in {time.time() - start_time:.3f} seconds "
+          f"({executor.boundary_edges} boundary edges replicated)")
+    for shard, sites in enumerate(executor.shard_sites):
+        print(f"  Shard {shard}: {executor.shard_sizes[shard]:>6} triples  {', '.join(sites)}")
+
+    reference = Shard(graph)
+
+    print(f"\n{'='*70}")
+    print("SCATTER-GATHER QUERIES")
+    print(f"{'='*70}")
+    print(f"{'Query':<15} {'Starts':>6} {'Matches':>8} {'Single ms':>10} {'Sharded ms':>11} "
+          f"{'Speedup':>8} {'Rounds':>7} {'Cross':>6} {'KB':>7}")
+    print(f"{'-'*86}")
+    consistent = True
+    try:
+        for name, (start_class, direction, match) in QUERIES.items():
+            starts = sorted(set(graph.subjects(RDF.type, start_class)), key=str)
+
+            start_time = time.time()
+            expected = run_single(reference, direction, starts, match)
+            single_time = time.time() - start_time
+
+            start_time = time.time()
+            results, traffic = executor.run(direction, starts, match)
+            sharded_time = time.time() - start_time
+
+            if results != expected:
+                consistent = False
+                print(f"  [ERROR] {name}: sharded results differ from the single-process run")
+            matches = sum(len(found) for found in results.values())
+            speedup = single_time / sharded_time if sharded_time else 0.0
+            print(f"{name:<15} {len(starts):>6} {matches:>8} {single_time*1000:>10.1f} "
+                  f"{sharded_time*1000:>11.1f} {speedup:>7.2f}x {traffic['rounds']:>7} "
+                  f"{traffic['continuations']:>6} {traffic['bytes']/1024:>7.1f}")
+    finally:
+        executor.close()
+
+    if consistent:
+        print("\n[OK] Sharded results match the single-process execution")
+    sys.exit(0 if consistent else 1)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nSharded execution interrupted by user.")
+        sys.exit(130)
+    except Exception as e:
+        print(f"\n[ERROR] Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Materialized Full-Stack Decomposition for IT Infrastructure Ontology
+
+This script maintains the BusinessProcess -> Application -> Pod ->
+VM/CloudInstance -> PhysicalServer decomposition (query-patterns.md
+3.1/3.2/3.8/3.9, notebook CELL 12) as a materialized view:
+- The containerized route (deployed_as + runs_on), the legacy
+  application server route (contains + deployed_on + hosted_on/runs_on)
+  and the container-bypassing route (hosted_on / runs_on on the
+  application)
+- The SERVER column follows runs_on/hosted_on through hypervisors down
+  to the PhysicalServer (or the last host when no physical server is
+  modelled)
+- A compact integer-coded table with a hash index on every column
+- Incremental maintenance: adding or removing a hosting triple only
+  recomputes the rows of the business processes above it
+"""
+
+import argparse
+import sys
+import time
+from array import array
+from collections import defaultdict
+
+from rdflib import RDF
+
+from test_queries import ONTO, load_combined_graph
+
+COLUMNS = ("business", "application", "container", "infrastructure", "server")
+
+# Predicates the view depends on; any other triple leaves it unchanged
+STACK_PROPERTIES = {
+    ONTO.realized_by: "realized_by",
+    ONTO.contains: "contains",
+    ONTO.deployed_as: "deployed_as",
+    ONTO.deployed_on: "deployed_on",
+    ONTO.runs_on: "runs_on",
+    ONTO.hosted_on: "hosted_on",
+}
+
+NULL = -1
+
+
+class StackView:
+    """Materialized, incrementally maintained full-stack decomposition table"""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.terms = []
+        self.term_ids = {}
+        self.columns = {name: array('l') for name in COLUMNS}
+        self.alive = bytearray()
+        self.free_rows = []
+        self.indexes = {name: defaultdict(set) for name in COLUMNS}
+        self.rows_by_business = defaultdict(set)
+
+        self.forward = {name: defaultdict(set) for name in STACK_PROPERTIES.values()}
+        self.reverse = defaultdict(set)
+        self.processes = set(graph.subjects(RDF.type, ONTO.BusinessProcess))
+        self.physical = set(graph.subjects(RDF.type, ONTO.PhysicalServer))
+        for predicate, name in STACK_PROPERTIES.items():
+            for s, o in graph.subject_objects(predicate):
+                self.forward[name][s].add(o)
+                self.reverse[o].add(s)
+
+        for process in self.processes:
+            self._materialize(process)
+
+    # ------------------------------------------------------------------
+    # Table storage
+    # ------------------------------------------------------------------
+
+    def _term_id(self, term):
+        if term is None:
+            return NULL
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            term_id = len(self.terms)
+            self.term_ids[term] = term_id
+            self.terms.append(term)
+        return term_id
+
+    def _insert_row(self, values):
+        ids = [self._term_id(v) for v in values]
+        if self.free_rows:
+            row = self.free_rows.pop()
+            for name, term_id in zip(COLUMNS, ids):
+                self.columns[name][row] = term_id
+            self.alive[row] = 1
+        else:
+            row = len(self.alive)
+            for name, term_id in zip(COLUMNS, ids):
+                self.columns[name].append(term_id)
+            self.alive.append(1)
+        for name, term_id in zip(COLUMNS, ids):
+            if term_id != NULL:
+                self.indexes[name][term_id].add(row)
+        self.rows_by_business[ids[0]].add(row)
+
+    def _delete_row(self, row):
+        for name in COLUMNS:
+            term_id = self.columns[name][row]
+            if term_id != NULL:
+                rows = self.indexes[name][term_id]
+                rows.discard(row)
+                if not rows:
+                    del self.indexes[name][term_id]
+            self.columns[name][row] = NULL
+        self.alive[row] = 0
+        self.free_rows.append(row)
+
+    def _row(self, row):
+        return tuple(None if self.columns[name][row] == NULL else self.terms[self.columns[name][row]]
+                     for name in COLUMNS)
+
+    def __len__(self):
+        return len(self.alive) - len(self.free_rows)
+
+    # ------------------------------------------------------------------
+    # Decomposition
+    # ------------------------------------------------------------------
+
+    def _hosts(self, term):
+        return self.forward["hosted_on"].get(term, set()) | self.forward["runs_on"].get(term, set())
+
+    def _servers(self, infra):
+        """Physical servers below infra, skipping hypervisors and other intermediate hosts
+
+        A chain that ends without reaching a PhysicalServer yields its last
+        host instead; infra itself is its own server when it is physical.
+        """
+        if infra is None:
+            return {None}
+        if infra in self.physical:
+            return {infra}
+        servers = set()
+        seen = {infra}
+        frontier = list(self._hosts(infra))
+        while frontier:
+            host = frontier.pop()
+            if host in seen:
+                continue
+            seen.add(host)
+            below = self._hosts(host)
+            if host in self.physical or not below:
+                servers.add(host)
+            else:
+                frontier.extend(below)
+        return servers or {None}
+
+    def _components(self, app):
+        """app and everything it contains, transitively"""
+        seen = {app}
+        frontier = [app]
+        while frontier:
+            for part in self.forward["contains"].get(frontier.pop(), ()):
+                if part not in seen:
+                    seen.add(part)
+                    frontier.append(part)
+        return seen
+
+    def _decompose(self, process):
+        """Yield every stack path below a business process"""
+        forward = self.forward
+        for app in forward["realized_by"].get(process, ()):
+            paths = set()
+            # Containerized: app deployed_as pod, pod runs_on node
+            for pod in forward["deployed_as"].get(app, ()):
+                for infra in forward["runs_on"].get(pod, ()) or (None,):
+                    for server in self._servers(infra):
+                        paths.add((process, app, pod, infra, server))
+            # Legacy: component deployed_on application server, hosted on a VM
+            for component in self._components(app):
+                for app_server in forward["deployed_on"].get(component, ()):
+                    for infra in self._hosts(app_server) or (None,):
+                        for server in self._servers(infra):
+                            paths.add((process, app, app_server, infra, server))
+            # Container-bypassing: app hosted_on / runs_on infrastructure
+            for infra in self._hosts(app):
+                for server in self._servers(infra):
+                    paths.add((process, app, None, infra, server))
+            if not paths:
+                paths.add((process, app, None, None, None))
+            yield from paths
+
+    def _materialize(self, process):
+        for values in self._decompose(process):
+            self._insert_row(values)
+
+    def _invalidate(self, process):
+        process_id = self.term_ids.get(process)
+        if process_id is None:
+            return
+        for row in list(self.rows_by_business.pop(process_id, ())):
+            self._delete_row(row)
+
+    def _processes_above(self, node):
+        """Business processes whose decomposition can reach node"""
+        seen = {node}
+        frontier = [node]
+        found = set()
+        while frontier:
+            current = frontier.pop()
+            if current in self.processes:
+                found.add(current)
+            for parent in self.reverse.get(current, ()):
+                if parent not in seen:
+                    seen.add(parent)
+                    frontier.append(parent)
+        return found
+
+    def _refresh(self, processes):
+        for process in processes:
+            self._invalidate(process)
+            if process in self.processes:
+                self._materialize(process)
+
+    # ------------------------------------------------------------------
+    # Write-through updates
+    # ------------------------------------------------------------------
+
+    def add(self, triple):
+        """Add a triple to the graph and update the affected rows"""
+        self.graph.add(triple)
+        self._apply(triple, adding=True)
+
+    def remove(self, triple):
+        """Remove a triple from the graph and update the affected rows"""
+        self.graph.remove(triple)
+        self._apply(triple, adding=False)
+
+    def _apply(self, triple, adding):
+        s, p, o = triple
+        if p == RDF.type and o == ONTO.BusinessProcess:
+            affected = self._processes_above(s) | {s}
+            if adding:
+                self.processes.add(s)
+            elif (s, RDF.type, ONTO.BusinessProcess) not in self.graph:
+                self.processes.discard(s)
+            self._refresh(affected)
+            return
+        if p == RDF.type and o == ONTO.PhysicalServer:
+            if adding:
+                self.physical.add(s)
+            elif (s, RDF.type, ONTO.PhysicalServer) not in self.graph:
+                self.physical.discard(s)
+            self._refresh(self._processes_above(s))
+            return
+
+        name = STACK_PROPERTIES.get(p)
+        if name is None:
+            return
+        if adding:
+            self.forward[name][s].add(o)
+            self.reverse[o].add(s)
+        else:
+            self.forward[name][s].discard(o)
+            if not any(o in self.forward[n].get(s, ()) for n in self.forward):
+                self.reverse[o].discard(s)
+        # Edges only point downwards, so the processes above s are unchanged
+        self._refresh(self._processes_above(s))
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def lookup(self, column, term):
+        """Return every stack path whose column equals term (index probe)"""
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            return []
+        return [self._row(row) for row in sorted(self.indexes[column].get(term_id, ()))]
+
+    def rows(self):
+        """Iterate over all materialized stack paths"""
+        for row in range(len(self.alive)):
+            if self.alive[row]:
+                yield self._row(row)
+
+
+def short_name(graph, term):
+    """Display name for an entity"""
+    if term is None:
+        return "-"
+    return str(graph.value(term, ONTO.name) or str(term).split('#')[-1])
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Materialized full-stack decomposition")
+    parser.add_argument("files", nargs="*", help="Turtle files to load (default: ontology and sample data)")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("IT Infrastructure Ontology - Materialized Stack Decomposition")
+    print("="*70)
+
+    graph = load_combined_graph(args.files or None)
+
+    start_time = time.time()
+    view = StackView(graph)
+    build_time = time.time() - start_time
+    print(f"\n[OK] Materialized {len(view)} stack paths in {build_time:.3f} seconds")
+
+    print(f"\n{'BUSINESS':<25} {'APPLICATION':<25} {'CONTAINER':<20} {'INFRASTRUCTURE':<20} {'SERVER':<20}")
+    print(f"{'-'*110}")
+    for row in sorted(view.rows(), key=lambda r: [short_name(graph, t) for t in r]):
+        print(" ".join(f"{short_name(graph, t)[:w-1]:<{w}}" for t, w in zip(row, (25, 25, 20, 20, 20))))
+
+    # Incremental maintenance demo: move one hosted workload and back,
+    # choosing a host that some stack path actually reaches
+    servers = sorted({row[4] for row in view.rows() if row[4] is not None}, key=str)
+    sample = next(((s, o) for o in servers for s in graph.subjects(ONTO.runs_on, o)), None)
+    if sample:
+        s, o = sample
+        before = len(view.lookup('server', o))
+        start_time = time.time()
+        view.remove((s, ONTO.runs_on, o))
+        view.add((s, ONTO.runs_on, o))
+        update_time = time.time() - start_time
+        print(f"\n[OK] Incremental remove+add of one runs_on triple: {update_time*1000:.2f} ms")
+        print(f"  Rows referencing {short_name(graph, o)}: {len(view.lookup('server', o))} (before: {before})")
+
+    sys.exit(0)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nInterrupted by user.")
+        sys.exit(130)
+    except Exception as e:
+        print(f"\n[ERROR] Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
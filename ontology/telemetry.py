@@ -0,0 +1,194 @@
+"""
+Load and Memory Telemetry for IT Infrastructure Ontology
+
+This module records structured metrics for the loader, validator and
+query runner:
+- Wall and CPU time per phase (per file, per scenario, per query)
+- Triples per second for phases that report a triple count
+- Retained RSS per phase, and optionally retained and peak Python heap
+  memory per phase (tracemalloc)
+- The process peak RSS at the end of each phase (process_peak_rss_bytes);
+  this is a high-water mark since process start, not a per-phase peak
+- Graph term counts (URIs, literals, blank nodes) and live object counts
+
+Metrics are written as JSON or Prometheus text exposition format, e.g.
+with `python test_queries.py --metrics metrics.prom`. tracemalloc makes
+parsing and inference several times slower, so it is only enabled with
+--metrics-trace-memory; compare timings only between runs with the same
+setting.
+"""
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+from rdflib import BNode, Literal
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+METRIC_PREFIX = "ontology"
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, or None where unavailable"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_rss_bytes():
+    """Current resident set size (Linux /proc), or None where unavailable"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except (OSError, AttributeError, IndexError, ValueError):
+        return None
+
+
+def graph_counts(graph):
+    """Triples and distinct terms of a graph, with the size of the term objects"""
+    terms = set(graph.all_nodes()) | set(graph.predicates())
+    literals = sum(1 for t in terms if isinstance(t, Literal))
+    bnodes = sum(1 for t in terms if isinstance(t, BNode))
+    return {
+        "triples": len(graph),
+        "terms": len(terms),
+        "uris": len(terms) - literals - bnodes,
+        "literals": literals,
+        "bnodes": bnodes,
+        "term_bytes": sum(sys.getsizeof(t) for t in terms),
+    }
+
+
+def phase(telemetry, name, **labels):
+    """telemetry.phase(), or a no-op context when telemetry is disabled"""
+    if telemetry is None:
+        return nullcontext({})
+    return telemetry.phase(name, **labels)
+
+
+class Telemetry:
+    """Collector of phase timings, memory and gauges for one run"""
+
+    def __init__(self, trace_memory=False):
+        self.phases = []
+        self.gauges = []
+        self._stack = []
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def phase(self, name, **labels):
+        """Time a phase; the yielded dict takes extra fields such as "triples" """
+        record = {"phase": name, "labels": {k: str(v) for k, v in labels.items()}}
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            memory_before, peak = tracemalloc.get_traced_memory()
+            # Resetting the peak would lose what the enclosing phase has
+            # allocated so far, so hand it to that phase first
+            if self._stack:
+                parent = self._stack[-1]
+                parent["_peak"] = max(parent.get("_peak", 0), peak)
+            tracemalloc.reset_peak()
+        rss_before = current_rss_bytes()
+        self._stack.append(record)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - wall_start
+            record["cpu_seconds"] = time.process_time() - cpu_start
+            self._stack.pop()
+            rss_after = current_rss_bytes()
+            if rss_before is not None and rss_after is not None:
+                record["rss_retained_bytes"] = rss_after - rss_before
+            if resource is not None:
+                record["process_peak_rss_bytes"] = peak_rss_bytes()
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                # Nested phases reset the peak, so take the peaks they handed up into account
+                peak = max(peak, record.pop("_peak", 0))
+                record["retained_bytes"] = current - memory_before
+                record["peak_bytes"] = peak - memory_before
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent["_peak"] = max(parent.get("_peak", 0), peak)
+            if record.get("triples") and record["seconds"] > 0:
+                record["triples_per_second"] = record["triples"] / record["seconds"]
+            self.phases.append(record)
+
+    def gauge(self, name, value, **labels):
+        """Record a point-in-time value, e.g. a term count"""
+        self.gauges.append({"name": name, "value": value, "labels": {k: str(v) for k, v in labels.items()}})
+
+    def graph_gauges(self, graph, **labels):
+        """Record graph_counts() of a graph as gauges"""
+        for name, value in graph_counts(graph).items():
+            self.gauge(f"graph_{name}", value, **labels)
+
+    def summary(self):
+        """All metrics as one dictionary"""
+        process = {
+            "peak_rss_bytes": peak_rss_bytes(),
+            "python_objects": len(gc.get_objects()),
+        }
+        if self.trace_memory and tracemalloc.is_tracing():
+            process["traced_bytes"] = tracemalloc.get_traced_memory()[0]
+        return {"phases": self.phases, "gauges": self.gauges, "process": process}
+
+    def to_json(self):
+        return json.dumps(self.summary(), indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format"""
+        summary = self.summary()
+        samples = {}
+        for record in summary["phases"]:
+            labels = {"phase": record["phase"], **record["labels"]}
+            for field, value in record.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    samples.setdefault(f"{METRIC_PREFIX}_phase_{field}", []).append((labels, value))
+        for gauge in summary["gauges"]:
+            samples.setdefault(f"{METRIC_PREFIX}_{gauge['name']}", []).append((gauge["labels"], gauge["value"]))
+        for name, value in summary["process"].items():
+            if value is not None:
+                samples.setdefault(f"{METRIC_PREFIX}_process_{name}", []).append(({}, value))
+
+        lines = []
+        for metric, values in samples.items():
+            lines.append(f"# TYPE {metric} gauge")
+            for labels, value in values:
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                lines.append(f"{metric}{{{label_text}}} {value}" if label_text else f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path, fmt=None):
+        """Write metrics to path; the format defaults from the suffix (.prom/.txt: Prometheus)"""
+        path = Path(path)
+        fmt = fmt or ("prometheus" if path.suffix in (".prom", ".txt") else "json")
+        text = self.to_prometheus() if fmt == "prometheus" else self.to_json()
+        path.write_text(text, encoding="utf-8")
+        return fmt
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def add_arguments(parser):
+    """Add the --metrics/--metrics-format options to a script's argument parser"""
+    parser.add_argument("--metrics", help="Write load, memory and timing metrics to this file")
+    parser.add_argument("--metrics-format", choices=["json", "prometheus"],
+                        help="Metrics format (default: from the file suffix, .prom/.txt for Prometheus)")
+    parser.add_argument("--metrics-trace-memory", action="store_true",
+                        help="Also trace Python heap memory per phase (tracemalloc, much slower)")
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Self-Check Script for the IT Infrastructure Ontology Analysis Scripts
+
+This script checks the analysis modules against known answers:
+- Dominators, articulation points and bridges of small hand-made graphs
+- Network routes of a hand-made topology
+- Ranked root causes of a hand-made failure scenario
+- Incrementally maintained structures against a full rebuild after the
+  same sequence of removals and additions
+- A property graph export read back and compared with the RDF it came from
+"""
+
+import csv
+import sys
+import tempfile
+from pathlib import Path
+
+from rdflib import RDF, RDFS, BNode, Dataset, Graph, Literal
+
+from dependency_analysis import (DependencyGraph, articulation_points_and_bridges,
+                                 immediate_dominators, infrastructure_dominators)
+from entity_index import EXACT_PROPERTIES, EntityIndex
+from layer_views import VIEW_PROPERTIES, ViewCatalog
+from network_paths import analyze_network_paths
+from property_graph_export import (PropertyGraphExporter, _is_schema, local_name,
+                                   relationship_type, validate_export)
+from reasoner import ASSERTED_GRAPH, Reasoner, is_schema_triple, load_dataset
+from root_cause import RootCauseAnalyzer
+from stack_view import STACK_PROPERTIES, StackView
+from test_queries import DEFAULT_FILES, INST, ONTO, load_combined_graph
+
+# The complex hybrid sample adds the legacy contains/deployed_on route
+CHECK_FILES = [Path(__file__).parent / name
+               for name in DEFAULT_FILES + ["sample-data-complex-hybrid.ttl"]]
+
+
+def check(results, name, passed):
+    """Record and print one self-check"""
+    print(f"  {'[OK]' if passed else '[FAIL]'} {name}")
+    results.append((name, passed))
+
+
+def test_dependency_analysis():
+    """Dominators, articulation points and bridges on known small graphs"""
+    print(f"\n{'#'*70}")
+    print("# DEPENDENCY ANALYSIS")
+    print(f"{'#'*70}")
+    results = []
+
+    # r -> a -> c, r -> b -> c, c -> d -> e
+    edges = {"r": ["a", "b"], "a": ["c"], "b": ["c"], "c": ["d"], "d": ["e"], "e": []}
+    idom = immediate_dominators("r", lambda v: edges[v])
+    check(results, "Immediate dominators of a diamond with a tail",
+          idom == {"a": "r", "b": "r", "c": "r", "d": "c", "e": "d"})
+
+    # A process realized by one application on two VMs of one hypervisor:
+    # the VMs are redundant, the application, hypervisor and server are not
+    dep = DependencyGraph()
+    dep.add_edge(INST.Process, INST.App)
+    dep.add_edge(INST.App, INST.VM1)
+    dep.add_edge(INST.App, INST.VM2)
+    dep.add_edge(INST.VM1, INST.Hypervisor)
+    dep.add_edge(INST.VM2, INST.Hypervisor)
+    dep.add_edge(INST.Hypervisor, INST.Server)
+    chain = [dep.nodes[v] for v in infrastructure_dominators(dep, dep.index[INST.Process])]
+    check(results, "Infrastructure dominators skip redundant VMs",
+          chain == [INST.Server, INST.Hypervisor, INST.App])
+
+    # Triangle a-b-c with a tail c-d-e
+    dep = DependencyGraph()
+    for s, t in [("a", "b"), ("b", "c"), ("c", "a"), ("c", "d"), ("d", "e")]:
+        dep.add_edge(INST[s], INST[t])
+    articulation, bridges = articulation_points_and_bridges(dep)
+    check(results, "Articulation points of a triangle with a tail",
+          {dep.nodes[v] for v in articulation} == {INST.c, INST.d})
+    check(results, "Bridges of a triangle with a tail",
+          {frozenset((dep.nodes[s], dep.nodes[t])) for s, t in bridges}
+          == {frozenset((INST.c, INST.d)), frozenset((INST.d, INST.e))})
+
+    return results
+
+
+def test_network_paths():
+    """Shortest routes, endpoint relaying and unreachable pairs on a hand-made topology"""
+    print(f"\n{'#'*70}")
+    print("# NETWORK PATHS")
+    print(f"{'#'*70}")
+    results = []
+
+    # AppA -> PathA -> FW1 -> Switch1 -> Router1 -> PathB -> AppB is the
+    # shortest route that relays through devices only; the shorter one
+    # through AppC (an endpoint on both paths) must not be taken, nor the
+    # longer one over SwitchX/SwitchY. AppD's path is not connected.
+    graph = Graph()
+    edges = [
+        ("AppA", "communicates_via", "PathA"), ("AppB", "communicates_via", "PathB"),
+        ("AppC", "communicates_via", "PathA"), ("AppC", "communicates_via", "PathB"),
+        ("AppD", "communicates_via", "PathD"),
+        ("PathA", "routes_through", "FW1"), ("PathB", "routes_through", "Router1"),
+        ("FW1", "connected_to", "Switch1"), ("Switch1", "connected_to", "Router1"),
+        ("FW1", "connected_to", "SwitchX"), ("SwitchX", "connected_to", "SwitchY"),
+        ("SwitchY", "connected_to", "Router1"),
+        ("AppA", "calls", "AppB"), ("AppA", "calls", "AppD"),
+        # 256 parallel devices into one hub: int8 path counts wrap to 0
+        ("Src", "communicates_via", "PathS"), ("Dst", "communicates_via", "PathT"),
+        ("PathT", "routes_through", "Hub"), ("Src", "calls", "Dst"),
+    ]
+    for i in range(256):
+        edges += [("PathS", "routes_through", f"Fan{i}"), (f"Fan{i}", "connected_to", "Hub")]
+    for s, p, o in edges:
+        graph.add((INST[s], ONTO[p], INST[o]))
+    graph.add((INST.FW1, RDF.type, ONTO.Firewall))
+    for name in ("PathA", "PathB", "PathD", "PathS", "PathT"):
+        graph.add((INST[name], RDF.type, ONTO.CommunicationPath))
+
+    rows = {(row["source"], row["target"]): row for row in analyze_network_paths(graph)}
+    route = rows[(INST.AppA, INST.AppB)]
+    check(results, "Shortest route and hop count",
+          route["route"] == [INST[n] for n in ("AppA", "PathA", "FW1", "Switch1", "Router1", "PathB", "AppB")]
+          and route["hops"] == 6)
+    check(results, "Routes never relay through another endpoint", INST.AppC not in route["route"])
+    check(results, "Firewalls on the route are reported", route["firewalls"] == [INST.FW1])
+    check(results, "A pair without a network route has route None",
+          rows[(INST.AppA, INST.AppD)]["route"] is None)
+    check(results, "256 paths into one node still reach it", rows[(INST.Src, INST.Dst)]["hops"] == 5)
+    return results
+
+
+def test_root_cause():
+    """Ranked causes and unexplained symptoms on a hand-made failure scenario"""
+    print(f"\n{'#'*70}")
+    print("# ROOT CAUSE ANALYSIS")
+    print(f"{'#'*70}")
+    results = []
+
+    # Host1 (failed) carries AppA, AppB and AppC, whose VM3 is degraded as
+    # well; AppC also uses a database on Host2 (failed), which carries AppD
+    # and AppG. AppE is on a failed VM5 of a failed Host3, AppF on healthy
+    # infrastructure. Host1 and two switches form a connected_to cycle.
+    graph = Graph()
+    edges = [
+        ("AppA", "hosted_on", "VM1"), ("AppB", "hosted_on", "VM2"), ("AppC", "hosted_on", "VM3"),
+        ("VM1", "runs_on", "Host1"), ("VM2", "runs_on", "Host1"), ("VM3", "runs_on", "Host1"),
+        ("AppC", "uses", "DB1"), ("DB1", "hosted_on", "VM4"), ("VM4", "runs_on", "Host2"),
+        ("AppD", "hosted_on", "VM4"), ("AppG", "hosted_on", "VM4"),
+        ("AppE", "hosted_on", "VM5"), ("VM5", "runs_on", "Host3"),
+        ("AppF", "hosted_on", "VM6"), ("VM6", "runs_on", "Host4"),
+        ("Host1", "connected_to", "Switch1"), ("Switch1", "connected_to", "Switch2"),
+        ("Switch2", "connected_to", "Host1"),
+    ]
+    for s, p, o in edges:
+        graph.add((INST[s], ONTO[p], INST[o]))
+    for name, status in [("Host1", "failed"), ("VM3", "degraded"), ("Host2", "failed"),
+                         ("VM5", "failed"), ("Host3", "failed"), ("Host4", "running")]:
+        graph.add((INST[name], ONTO.lifecycle_status, Literal(status)))
+
+    analyzer = RootCauseAnalyzer(graph)
+    cycle = {analyzer.component[analyzer.dep.index[INST[n]]] for n in ("Host1", "Switch1", "Switch2")}
+    check(results, "connected_to cycle collapses into one component",
+          len(cycle) == 1 and len(analyzer.members[cycle.pop()]) == 3)
+
+    symptoms = [INST[n] for n in ("AppA", "AppB", "AppC", "AppD", "AppE", "AppF", "AppG", "Unknown")]
+    causes, unexplained = analyzer.analyze(symptoms)
+    check(results, "Greedy cover ranks causes by symptoms explained",
+          [cause for cause, _ in causes] == [INST.Host1, INST.Host2, INST.Host3])
+    check(results, "Each cause lists only the symptoms it newly explains",
+          [explained for _, explained in causes] == [[INST.AppA, INST.AppB, INST.AppC],
+                                                     [INST.AppD, INST.AppG], [INST.AppE]])
+    check(results, "Tie between a VM and its failed host goes to the host", INST.VM5 not in dict(causes))
+    check(results, "Symptoms without a failed dependency are unexplained",
+          unexplained == [INST.AppF, INST.Unknown])
+
+    graph.set((INST.Host2, ONTO.lifecycle_status, Literal("running")))
+    analyzer.refresh_status()
+    causes, unexplained = analyzer.analyze(symptoms)
+    check(results, "refresh_status() drops memoized failures",
+          dict(causes).get(INST.Host1) == [INST.AppA, INST.AppB, INST.AppC]
+          and unexplained == [INST.AppD, INST.AppF, INST.AppG, INST.Unknown])
+    return results
+
+
+def churn(triples, remove, add):
+    """Remove every third triple, then add every other removed one back"""
+    removed = sorted(triples, key=lambda t: tuple(map(str, t)))[::3]
+    for triple in removed:
+        remove(triple)
+    for triple in removed[::2]:
+        add(triple)
+    return removed
+
+
+def test_stack_view():
+    """StackView after incremental updates equals a rebuild"""
+    print(f"\n{'#'*70}")
+    print("# STACK VIEW")
+    print(f"{'#'*70}")
+    results = []
+    graph = load_combined_graph(CHECK_FILES)
+    view = StackView(graph)
+
+    legacy = view.lookup("application", INST.LegacyERPSystem)
+    check(results, "Legacy route reaches the application server",
+          any(row[2] == INST.WebLogicCluster for row in legacy))
+    servers = {row[4] for row in view.rows() if row[4] is not None}
+    check(results, "Server column holds physical servers, not hypervisors",
+          any((s, RDF.type, ONTO.PhysicalServer) in graph for s in servers)
+          and not any((s, RDF.type, ONTO.Hypervisor) in graph for s in servers))
+
+    triples = [t for p in STACK_PROPERTIES for t in graph.triples((None, p, None))]
+    churn(triples, view.remove, view.add)
+    check(results, "Stack view updates match a full rebuild",
+          sorted(view.rows(), key=str) == sorted(StackView(graph).rows(), key=str))
+    return results
+
+
+def _read_csvs(out_dir, pattern):
+    rows = []
+    for path in sorted(Path(out_dir).glob(pattern)):
+        with open(path, newline="", encoding="utf-8") as f:
+            rows.extend(map(tuple, csv.reader(f)))
+    return rows
+
+
+def test_property_graph_export():
+    """Export round trip: labels and relationships match the RDF graph"""
+    print(f"\n{'#'*70}")
+    print("# PROPERTY GRAPH EXPORT")
+    print(f"{'#'*70}")
+    results = []
+    graph = load_combined_graph(CHECK_FILES)
+
+    with tempfile.TemporaryDirectory() as small_runs, tempfile.TemporaryDirectory() as one_run:
+        # Tiny sort runs force the external merge; one run is the in-memory case
+        for out_dir, chunk_records in ((small_runs, 7), (one_run, len(graph) * 2)):
+            exporter = PropertyGraphExporter(out_dir, partitions=3, workers=1, chunk_records=chunk_records)
+            exporter.add_graph(graph)
+            exporter.finish()
+
+        check(results, "Export passes validate_export()", validate_export(small_runs) == [])
+        nodes = _read_csvs(small_runs, "nodes_part_*.csv")
+        relationships = _read_csvs(small_runs, "relationships_part_*.csv")
+        check(results, "External sort in small runs writes the same rows as one run",
+              sorted(nodes) == sorted(_read_csvs(one_run, "nodes_part_*.csv"))
+              and sorted(relationships) == sorted(_read_csvs(one_run, "relationships_part_*.csv")))
+
+    expected_labels = {}
+    expected_relationships = set()
+    for s, p, o in graph:
+        if isinstance(s, BNode) or isinstance(o, BNode) or (_is_schema(str(p)) and p != RDF.type):
+            continue
+        if p == RDF.type:
+            if not _is_schema(str(o)):
+                expected_labels.setdefault(str(s), set()).add(local_name(str(o)))
+        elif not isinstance(o, Literal):
+            expected_relationships.add((str(s), str(o), relationship_type(str(p))))
+    labels = {row[0]: set(row[1].split(";")) for row in nodes}
+    check(results, "Node labels round-trip the rdf:type statements",
+          all(labels.get(iri) == expected for iri, expected in expected_labels.items()))
+    check(results, "Relationships round-trip the object property statements",
+          set(relationships) == expected_relationships and len(relationships) == len(expected_relationships))
+    return results
+
+
+def test_layer_views():
+    """Existing views follow write-through updates and match a new catalog"""
+    print(f"\n{'#'*70}")
+    print("# LAYER VIEWS")
+    print(f"{'#'*70}")
+    results = []
+    graph = load_combined_graph(CHECK_FILES)
+    catalog = ViewCatalog(graph)
+
+    location = sorted(graph.objects(None, ONTO.location))[0]
+    filters = [{"layer": 4}, {"layer": 2}, {"location": str(location)},
+               {"layer": 4, "cloud_provider": "aws"}, {"region": "us-east-1"}]
+    views = [(f, catalog.view(**f)) for f in filters]
+
+    def current():
+        fresh = ViewCatalog(graph)
+        return all(set(view) == set(fresh.view(**f)) for f, view in views)
+
+    subject = next(graph.subjects(ONTO.location, location))
+    catalog.set((subject, ONTO.location, Literal("Relocated")))
+    check(results, "set() of a location updates existing views", current())
+
+    predicates = [RDF.type] + [ONTO[key] for key in VIEW_PROPERTIES]
+    triples = [t for p in predicates for t in graph.triples((None, p, None))]
+    churn(triples, catalog.remove, catalog.add)
+    check(results, "Layer view updates match a new catalog", current())
+
+    catalog.add((ONTO.EdgeServer, RDFS.subClassOf, ONTO.PhysicalServer))
+    catalog.add((INST.EdgeServer01, RDF.type, ONTO.EdgeServer))
+    check(results, "A new subclass moves its instances into the layer", current())
+
+    graph.add((INST.EdgeServer02, RDF.type, ONTO.PhysicalServer))
+    catalog.refresh()
+    check(results, "refresh() after a direct graph edit keeps existing views", current())
+    return results
+
+
+def _index_state(index):
+    return (
+        {k: v for k, v in index.exact.items() if v},
+        {k: v for k, v in index.postings.items() if v},
+        {k: v for k, v in index.values.items() if v},
+        index.sorted_values,
+    )
+
+
+def test_entity_index():
+    """EntityIndex after incremental updates equals a rebuild"""
+    print(f"\n{'#'*70}")
+    print("# ENTITY INDEX")
+    print(f"{'#'*70}")
+    results = []
+    graph = load_combined_graph(CHECK_FILES)
+    index = EntityIndex(graph)
+
+    triples = [t for p in EXACT_PROPERTIES for t in graph.triples((None, ONTO[p], None))]
+    removed = churn(triples, index.remove, index.add)
+    check(results, "Entity index updates match a full rebuild",
+          _index_state(index) == _index_state(EntityIndex(graph)))
+
+    gone = [t for t in removed[1::2] if t[1] == ONTO.name and not graph.value(t[0], ONTO.name)]
+    check(results, "Removed names are no longer found",
+          bool(gone) and not any(t[0] in index.lookup("name", t[2]) for t in gone))
+    return results
+
+
+def _materialized(asserted):
+    """Inferred triples of a new Reasoner over a copy of asserted"""
+    dataset = Dataset(default_union=True)
+    copy = dataset.graph(ASSERTED_GRAPH)
+    for triple in asserted:
+        copy.add(triple)
+    reasoner = Reasoner(dataset)
+    reasoner.materialize()
+    return set(reasoner.inferred)
+
+
+def test_reasoner():
+    """Incremental (semi-naive / DRed) maintenance equals rematerialization"""
+    print(f"\n{'#'*70}")
+    print("# REASONER")
+    print(f"{'#'*70}")
+    results = []
+    reasoner = Reasoner(load_dataset(CHECK_FILES))
+    reasoner.materialize()
+
+    triples = [t for t in reasoner.asserted if not is_schema_triple(t)]
+    churn(triples, reasoner.remove, reasoner.add)
+    check(results, "Reasoner updates match a rematerialization",
+          set(reasoner.inferred) == _materialized(reasoner.asserted))
+
+    reasoner.add((INST.EdgeServer01, RDF.type, ONTO.EdgeServer))
+    reasoner.add((ONTO.EdgeServer, RDFS.subClassOf, ONTO.PhysicalServer))
+    check(results, "A schema update rematerializes the inferred graph",
+          (INST.EdgeServer01, RDF.type, ONTO.PhysicalServer) in reasoner.inferred
+          and set(reasoner.inferred) == _materialized(reasoner.asserted))
+    return results
+
+
+def print_summary(all_results):
+    """Print summary of all self-checks"""
+    print(f"\n{'='*70}")
+    print("SELF-CHECK SUMMARY")
+    print(f"{'='*70}")
+
+    passed = sum(1 for _, success in all_results if success)
+    print(f"\nChecks passed: {passed}/{len(all_results)}")
+    for name, success in all_results:
+        if not success:
+            print(f"  [FAIL] {name}")
+    return passed == len(all_results)
+
+
+def main():
+    """Main self-check function"""
+    print("="*70)
+    print("IT Infrastructure Ontology - Analysis Self-Checks")
+    print("="*70)
+
+    all_results = []
+    all_results.extend(test_dependency_analysis())
+    all_results.extend(test_network_paths())
+    all_results.extend(test_root_cause())
+    all_results.extend(test_stack_view())
+    all_results.extend(test_property_graph_export())
+    all_results.extend(test_layer_views())
+    all_results.extend(test_entity_index())
+    all_results.extend(test_reasoner())
+
+    if print_summary(all_results):
+        print(f"\n[OK] All self-checks passed successfully!")
+        sys.exit(0)
+    else:
+        print(f"\n[FAIL] Some self-checks failed. See details above.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\nSelf-checks interrupted by user.")
+        sys.exit(130)
+    except Exception as e:
+        print(f"\n[ERROR] Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
@@ -9,53 +9,76 @@ This script tests SPARQL queries against sample instance data to verify:
 - Query performance is acceptable
 """
 
+import argparse
+import re
 import sys
 from pathlib import Path
 from rdflib import Graph, Namespace
 from rdflib.plugins.sparql import prepareQuery
 import time
 
+import telemetry as metrics
+
 # Define namespaces
 ONTO = Namespace("http://example.org/it-infrastructure-ontology#")
 INST = Namespace("http://example.org/instances#")
 
-def load_combined_graph():
-    """Load ontology and all sample data into a single graph"""
+# Rack, slot and room suffixes do not make a separate site
+SITE_SUFFIX = re.compile(r"-(Rack|Slot|Storage).*$")
+
+# Files loaded when no explicit list is given
+DEFAULT_FILES = [
+    "it-infrastructure-ontology.ttl",
+    "sample-data-onpremises.ttl",
+    "sample-data-cloud.ttl",
+    "sample-data-containerized.ttl",
+    "sample-data-hybrid.ttl",
+]
+
+def site_of(location):
+    """Site of a location, without its rack, slot or room suffix"""
+    return SITE_SUFFIX.sub("", str(location))
+
+def load_combined_graph(files=None, telemetry=None):
+    """Load ontology and sample data (or the given files) into a single graph"""
     print("Loading ontology and sample data...")
     g = Graph()
     
-    base_path = Path(__file__).parent
-    files = [
-        base_path / "it-infrastructure-ontology.ttl",
-        base_path / "sample-data-onpremises.ttl",
-        base_path / "sample-data-cloud.ttl",
-        base_path / "sample-data-containerized.ttl",
-        base_path / "sample-data-hybrid.ttl",
-    ]
-    
-    for file_path in files:
-        if file_path.exists():
-            g.parse(file_path, format='turtle')
-            print(f"  [OK] Loaded {file_path.name}")
-        else:
-            print(f"  [ERROR] File not found: {file_path.name}")
+    if files is None:
+        base_path = Path(__file__).parent
+        files = [base_path / name for name in DEFAULT_FILES]
+    
+    with metrics.phase(telemetry, "load_total") as total:
+        for file_path in map(Path, files):
+            if file_path.exists():
+                before = len(g)
+                with metrics.phase(telemetry, "load", file=file_path.name) as record:
+                    g.parse(file_path, format='turtle')
+                    record["triples"] = len(g) - before
+                    record["file_bytes"] = file_path.stat().st_size
+                print(f"  [OK] Loaded {file_path.name}")
+            else:
+                print(f"  [ERROR] File not found: {file_path.name}")
+        total["triples"] = len(g)
     
     print(f"\nTotal triples loaded: {len(g)}")
     return g
 
-def run_query(graph, query_name, query_string, expected_min_results=0):
+def run_query(graph, query_name, query_string, expected_min_results=0, telemetry=None):
     """Execute a SPARQL query and return results"""
     print(f"\n{'='*70}")
     print(f"Query: {query_name}")
     print(f"{'='*70}")
     
     try:
-        start_time = time.time()
-        results = graph.query(query_string)
-        execution_time = time.time() - start_time
-        
-        result_list = list(results)
-        result_count = len(result_list)
+        with metrics.phase(telemetry, "query", query=query_name) as record:
+            start_time = time.time()
+            results = graph.query(query_string)
+            execution_time = time.time() - start_time
+            
+            result_list = list(results)
+            result_count = len(result_list)
+            record["results"] = result_count
         
         print(f"[OK] Query executed successfully")
         print(f"  Execution time: {execution_time:.3f} seconds")
@@ -79,7 +102,7 @@ def run_query(graph, query_name, query_string, expected_min_results=0):
         print(f"[FAIL] Query failed: {e}")
         return False, 0, 0
 
-def test_root_cause_queries(graph):
+def test_root_cause_queries(graph, telemetry=None):
     """Test root cause analysis queries"""
     print(f"\n{'#'*70}")
     print("# ROOT CAUSE ANALYSIS QUERIES")
@@ -102,7 +125,7 @@ def test_root_cause_queries(graph):
     }
     LIMIT 10
     """
-    success, count, time_taken = run_query(graph, "Find Failed Dependencies", query1, 0)
+    success, count, time_taken = run_query(graph, "Find Failed Dependencies", query1, 0, telemetry)
     results.append(("Find Failed Dependencies", success, count, time_taken))
     
     # Query 2: Trace to physical infrastructure
@@ -119,7 +142,7 @@ def test_root_cause_queries(graph):
     }
     LIMIT 10
     """
-    success, count, time_taken = run_query(graph, "Trace to Physical Infrastructure", query2, 1)
+    success, count, time_taken = run_query(graph, "Trace to Physical Infrastructure", query2, 1, telemetry)
     results.append(("Trace to Physical Infrastructure", success, count, time_taken))
     
     # Query 3: Find storage dependencies
@@ -135,12 +158,12 @@ def test_root_cause_queries(graph):
     }
     LIMIT 10
     """
-    success, count, time_taken = run_query(graph, "Find Storage Dependencies", query3, 1)
+    success, count, time_taken = run_query(graph, "Find Storage Dependencies", query3, 1, telemetry)
     results.append(("Find Storage Dependencies", success, count, time_taken))
     
     return results
 
-def test_impact_analysis_queries(graph):
+def test_impact_analysis_queries(graph, telemetry=None):
     """Test impact analysis queries"""
     print(f"\n{'#'*70}")
     print("# IMPACT ANALYSIS QUERIES")
@@ -163,7 +186,7 @@ def test_impact_analysis_queries(graph):
     }
     LIMIT 10
     """
-    success, count, time_taken = run_query(graph, "Find Applications on Server", query1, 1)
+    success, count, time_taken = run_query(graph, "Find Applications on Server", query1, 1, telemetry)
     results.append(("Find Applications on Server", success, count, time_taken))
     
     # Query 2: Find applications using a database
@@ -179,7 +202,7 @@ def test_impact_analysis_queries(graph):
     }
     LIMIT 10
     """
-    success, count, time_taken = run_query(graph, "Find Applications Using Database", query2, 1)
+    success, count, time_taken = run_query(graph, "Find Applications Using Database", query2, 1, telemetry)
     results.append(("Find Applications Using Database", success, count, time_taken))
     
     # Query 3: Find services using network device
@@ -195,12 +218,12 @@ def test_impact_analysis_queries(graph):
     }
     LIMIT 10
     """
-    success, count, time_taken = run_query(graph, "Find Services Using Network Device", query3, 1)
+    success, count, time_taken = run_query(graph, "Find Services Using Network Device", query3, 1, telemetry)
     results.append(("Find Services Using Network Device", success, count, time_taken))
     
     return results
 
-def test_decomposition_queries(graph):
+def test_decomposition_queries(graph, telemetry=None):
     """Test decomposition and traversal queries"""
     print(f"\n{'#'*70}")
     print("# DECOMPOSITION AND TRAVERSAL QUERIES")
@@ -221,7 +244,7 @@ def test_decomposition_queries(graph):
     }
     LIMIT 10
     """
-    success, count, time_taken = run_query(graph, "Business Process to Application", query1, 1)
+    success, count, time_taken = run_query(graph, "Business Process to Application", query1, 1, telemetry)
     results.append(("Business Process to Application", success, count, time_taken))
     
     # Query 2: Application to container to VM
@@ -238,7 +261,7 @@ def test_decomposition_queries(graph):
     }
     LIMIT 10
     """
-    success, count, time_taken = run_query(graph, "Application to Container to VM", query2, 1)
+    success, count, time_taken = run_query(graph, "Application to Container to VM", query2, 1, telemetry)
     results.append(("Application to Container to VM", success, count, time_taken))
     
     # Query 3: Full stack decomposition
@@ -255,7 +278,7 @@ def test_decomposition_queries(graph):
     }
     LIMIT 10
     """
-    success, count, time_taken = run_query(graph, "Full Stack Decomposition", query3, 1)
+    success, count, time_taken = run_query(graph, "Full Stack Decomposition", query3, 1, telemetry)
     results.append(("Full Stack Decomposition", success, count, time_taken))
     
     # Query 4: Network topology
@@ -270,7 +293,7 @@ def test_decomposition_queries(graph):
     }
     LIMIT 10
     """
-    success, count, time_taken = run_query(graph, "Network Topology", query4, 0)
+    success, count, time_taken = run_query(graph, "Network Topology", query4, 0, telemetry)
     results.append(("Network Topology", success, count, time_taken))
     
     # Query 5: Security relationships
@@ -285,7 +308,7 @@ def test_decomposition_queries(graph):
     }
     LIMIT 10
     """
-    success, count, time_taken = run_query(graph, "Security Relationships", query5, 1)
+    success, count, time_taken = run_query(graph, "Security Relationships", query5, 1, telemetry)
     results.append(("Security Relationships", success, count, time_taken))
     
     return results
@@ -318,22 +341,32 @@ def print_summary(all_results):
 
 def main():
     """Main test function"""
+    parser = argparse.ArgumentParser(description="Run the SPARQL query test suite")
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+    telemetry = metrics.Telemetry(args.metrics_trace_memory) if args.metrics else None
+    
     print("="*70)
     print("IT Infrastructure Ontology - Query Testing")
     print("="*70)
     
     # Load data
-    graph = load_combined_graph()
+    graph = load_combined_graph(telemetry=telemetry)
     
     # Run all query tests
     all_results = []
-    all_results.extend(test_root_cause_queries(graph))
-    all_results.extend(test_impact_analysis_queries(graph))
-    all_results.extend(test_decomposition_queries(graph))
+    all_results.extend(test_root_cause_queries(graph, telemetry))
+    all_results.extend(test_impact_analysis_queries(graph, telemetry))
+    all_results.extend(test_decomposition_queries(graph, telemetry))
     
     # Print summary
     all_passed = print_summary(all_results)
     
+    if telemetry:
+        telemetry.graph_gauges(graph)
+        fmt = telemetry.write(args.metrics, args.metrics_format)
+        print(f"\n[OK] Metrics ({fmt}) written to {args.metrics}")
+    
     if all_passed:
         print(f"\n[OK] All query tests passed successfully!")
         sys.exit(0)
@@ -9,43 +9,69 @@ This script validates sample instance data against SHACL shapes to ensure:
 - Cross-layer relationship rules are followed
 """
 
+import argparse
 import sys
 from pathlib import Path
 from rdflib import Graph
+from owlrl import DeductiveClosure
 from pyshacl import validate
+from pyshacl.inference import CustomRDFSSemantics
 
-def load_graph(file_path):
+import telemetry as metrics
+
+def load_graph(file_path, telemetry=None):
     """Load RDF graph from file"""
     g = Graph()
     try:
-        g.parse(file_path, format='turtle')
+        with metrics.phase(telemetry, "load", file=Path(file_path).name) as record:
+            g.parse(file_path, format='turtle')
+            record["triples"] = len(g)
+            record["file_bytes"] = Path(file_path).stat().st_size
         print(f"✓ Loaded {len(g)} triples from {file_path}")
         return g
     except Exception as e:
         print(f"✗ Error loading {file_path}: {e}")
         return None
 
-def validate_data(data_graph, shapes_graph, ontology_graph, scenario_name):
+def rdfs_inference(graph):
+    """Expand graph in place with the RDFS closure pySHACL's inference='rdfs' applies"""
+    # Reproduces pySHACL's own pre-inference (Validator._run_pre_inference
+    # with inference='rdfs'); re-check it against validate(..., inference='rdfs')
+    # whenever pySHACL or owlrl is upgraded
+    DeductiveClosure(CustomRDFSSemantics).expand(graph)
+
+def validate_data(data_graph, shapes_graph, ontology_graph, scenario_name, telemetry=None):
     """Validate data graph against SHACL shapes"""
     print(f"\n{'='*70}")
     print(f"Validating: {scenario_name}")
     print(f"{'='*70}")
     
     # Combine ontology and data for validation
-    combined_graph = data_graph + ontology_graph
-    
-    # Run SHACL validation
-    conforms, results_graph, results_text = validate(
-        combined_graph,
-        shacl_graph=shapes_graph,
-        ont_graph=ontology_graph,
-        inference='rdfs',
-        abort_on_first=False,
-        allow_warnings=True,
-        meta_shacl=False,
-        advanced=True,
-        js=False
-    )
+    with metrics.phase(telemetry, "combine", scenario=scenario_name) as record:
+        combined_graph = data_graph + ontology_graph
+        record["triples"] = len(combined_graph)
+    
+    # Run RDFS inference as its own phase, then SHACL validation on the
+    # expanded graph; the remainder after inference is constraint checking
+    with metrics.phase(telemetry, "validate", scenario=scenario_name) as record:
+        with metrics.phase(telemetry, "inference", scenario=scenario_name) as inference:
+            rdfs_inference(combined_graph)
+            inference["triples"] = len(combined_graph)
+        conforms, results_graph, results_text = validate(
+            combined_graph,
+            shacl_graph=shapes_graph,
+            ont_graph=ontology_graph,
+            inference='none',
+            abort_on_first=False,
+            allow_warnings=True,
+            meta_shacl=False,
+            advanced=True,
+            js=False
+        )
+        record["triples"] = len(combined_graph)
+    if telemetry:
+        record["inference_seconds"] = inference["seconds"]
+        record["constraint_seconds"] = record["seconds"] - record["inference_seconds"]
     
     # Print results
     if conforms:
@@ -67,6 +93,11 @@ def validate_data(data_graph, shapes_graph, ontology_graph, scenario_name):
 
 def main():
     """Main validation function"""
+    parser = argparse.ArgumentParser(description="Validate the sample data against the SHACL shapes")
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+    telemetry = metrics.Telemetry(args.metrics_trace_memory) if args.metrics else None
+    
     print("="*70)
     print("IT Infrastructure Ontology - Sample Data Validation")
     print("="*70)
@@ -85,8 +116,8 @@ def main():
     
     # Load ontology and shapes
     print("\nLoading ontology and SHACL shapes...")
-    ontology_graph = load_graph(ontology_file)
-    shapes_graph = load_graph(shapes_file)
+    ontology_graph = load_graph(ontology_file, telemetry)
+    shapes_graph = load_graph(shapes_file, telemetry)
     
     if not ontology_graph or not shapes_graph:
         print("\n✗ Failed to load ontology or shapes. Exiting.")
@@ -102,12 +133,14 @@ def main():
             results[scenario_name] = False
             continue
         
-        data_graph = load_graph(sample_file)
+        data_graph = load_graph(sample_file, telemetry)
         if not data_graph:
             results[scenario_name] = False
             continue
         
-        conforms, violations = validate_data(data_graph, shapes_graph, ontology_graph, scenario_name)
+        conforms, violations = validate_data(data_graph, shapes_graph, ontology_graph, scenario_name, telemetry)
+        if telemetry:
+            telemetry.graph_gauges(data_graph, scenario=scenario_name)
         results[scenario_name] = conforms
         
         if violations:
@@ -135,6 +168,10 @@ def main():
             print(f"\n[{scenario}]")
             print(f"  {violation}")
     
+    if telemetry:
+        fmt = telemetry.write(args.metrics, args.metrics_format)
+        print(f"\n✓ Metrics ({fmt}) written to {args.metrics}")
+    
     # Exit with appropriate code
     if passed == total:
         print(f"\n✓ All validations passed successfully!")